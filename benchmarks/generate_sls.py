@@ -0,0 +1,126 @@
+"""Generator pasangan data sintetis GeoPackage + Master Excel untuk benchmark.
+
+Contoh:
+    python benchmarks/generate_sls.py 100000 --output data_bench/
+    python benchmarks/generate_sls.py 10000 --nmsls 0.05 --duplikat 0.02 --seed 7
+
+Master berisi idsubsls 16 digit (prov, kab, kec, desa, sls, subsls) dengan
+kdsubsls = dua digit terakhir idsubsls. GeoPackage adalah salinannya dengan
+porsi ketidakcocokan yang dapat diatur: beda nmsls, kdsubsls 1 digit dan
+3 digit, idsubsls duplikat di kedua sisi, serta ID yang hanya ada di salah
+satu sisi.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Batas baris satu sheet Excel (tanpa header)
+MAKS_BARIS_EXCEL = 1048575
+
+PORSI_DEFAULT = {
+    'nmsls': 0.02,          # nmsls GPKG berbeda dari Master
+    'kd_1digit': 0.01,      # kdsubsls GPKG hanya 1 digit ('0' bukan '00')
+    'kd_3digit': 0.01,      # kdsubsls GPKG 3 digit ('000')
+    'duplikat': 0.01,       # baris yang diduplikasi (separuh di GPKG, separuh di Master)
+    'hilang_master': 0.01,  # ID hanya ada di GPKG
+    'hilang_gpkg': 0.01,    # ID hanya ada di Master
+}
+
+
+def _idsubsls(n, rng):
+    """n idsubsls unik berurutan wilayah; sekitar 10% baris adalah sub-SLS ('01', '02', ...)."""
+    baru = rng.random(n) >= 0.1
+    baru[0] = True
+    # Sub-SLS memakai kode SLS yang sama dengan baris '00' sebelumnya
+    sls_ke = np.cumsum(baru) - 1
+    sub = np.arange(n) - np.flatnonzero(baru)[sls_ke]
+    kab = 1 + sls_ke // 400000 % 99
+    kec = 1 + sls_ke // 40000 % 999
+    desa = 1 + sls_ke // 2000 % 999
+    sls = 1 + sls_ke % 2000
+    ids = [f"32{a:02d}{b:03d}{c:03d}{d:04d}{e:02d}" for a, b, c, d, e in zip(kab, kec, desa, sls, sub)]
+    return np.array(ids, dtype=object), sub
+
+
+def generate(n, seed=0, **porsi):
+    """Bangun (df_gpkg, df_master) dengan n baris dasar; porsi mengikuti PORSI_DEFAULT."""
+    porsi = {**PORSI_DEFAULT, **porsi}
+    rng = np.random.default_rng(seed)
+    ids, sub = _idsubsls(n, rng)
+    nmsls = np.array([f"RT {a:03d} RW {b:02d}" for a, b in zip(rng.integers(1, 30, n), rng.integers(1, 15, n))],
+                     dtype=object)
+    kdsubsls = np.array([f"{x:02d}" for x in sub], dtype=object)
+    master = pd.DataFrame({'idsubsls': ids, 'nmsls': nmsls, 'kdsubsls': kdsubsls})
+    gpkg = master.copy()
+
+    # Setiap baris mendapat paling banyak satu jenis gangguan agar porsinya tepat
+    urutan = rng.permutation(n)
+    batas = np.cumsum([int(n * porsi[k]) for k in PORSI_DEFAULT])
+    kelompok = dict(zip(PORSI_DEFAULT, np.split(urutan, batas)[:len(PORSI_DEFAULT)]))
+
+    gpkg.loc[kelompok['nmsls'], 'nmsls'] = gpkg.loc[kelompok['nmsls'], 'nmsls'] + ' (edit)'
+    gpkg.loc[kelompok['kd_1digit'], 'kdsubsls'] = gpkg.loc[kelompok['kd_1digit'], 'kdsubsls'].str[-1]
+    gpkg.loc[kelompok['kd_3digit'], 'kdsubsls'] = '0' + gpkg.loc[kelompok['kd_3digit'], 'kdsubsls']
+
+    dup = kelompok['duplikat']
+    dup_gpkg, dup_master = dup[:len(dup) // 2], dup[len(dup) // 2:]
+    gpkg = pd.concat([gpkg.drop(index=kelompok['hilang_gpkg']), gpkg.loc[dup_gpkg]], ignore_index=False)
+    master = pd.concat([master.drop(index=kelompok['hilang_master']), master.loc[dup_master]], ignore_index=False)
+    # Baris duplikat diletakkan di samping baris aslinya, seperti hasil digitasi ulang
+    gpkg = gpkg.sort_index(kind='stable').reset_index(drop=True)
+    master = master.sort_index(kind='stable').reset_index(drop=True)
+    if len(master) > MAKS_BARIS_EXCEL:
+        master = master.iloc[:MAKS_BARIS_EXCEL]
+    return gpkg, master
+
+
+def write_pair(gpkg, master, folder, nama):
+    """Tulis GeoPackage (kotak grid per fitur) dan Master Excel; kembalikan kedua path."""
+    import geopandas as gpd
+    import shapely
+
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    gpkg_path, excel_path = folder / f"{nama}.gpkg", folder / f"{nama}.xlsx"
+
+    kolom = np.arange(len(gpkg)) % 1000
+    baris = np.arange(len(gpkg)) // 1000
+    geometri = shapely.box(kolom * 10.0, baris * 10.0, kolom * 10.0 + 10, baris * 10.0 + 10)
+    # Tulis ke nama sementara dulu agar file setengah jadi tidak dianggap data yang valid
+    tmp_gpkg, tmp_excel = folder / f"{nama}.tmp.gpkg", folder / f"{nama}.tmp.xlsx"
+    gpd.GeoDataFrame(gpkg, geometry=geometri, crs='EPSG:32748').to_file(tmp_gpkg, driver='GPKG', layer='sls')
+    master.to_excel(tmp_excel, index=False)
+    os.replace(tmp_gpkg, gpkg_path)
+    os.replace(tmp_excel, excel_path)
+    return gpkg_path, excel_path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Buat pasangan data SLS sintetis untuk benchmark.")
+    parser.add_argument('jumlah', type=int, help="Jumlah baris dasar (mis. 10000, 100000, 1000000)")
+    parser.add_argument('--output', default='data_bench', help="Folder keluaran (default: data_bench)")
+    parser.add_argument('--nama', help="Nama file tanpa ekstensi (default: sls_<jumlah>)")
+    parser.add_argument('--seed', type=int, default=0)
+    for kunci, nilai in PORSI_DEFAULT.items():
+        parser.add_argument(f"--{kunci.replace('_', '-')}", type=float, default=nilai, dest=kunci,
+                            help=f"Porsi baris (default: {nilai})")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    mulai = time.perf_counter()
+    gpkg, master = generate(args.jumlah, args.seed, **{k: getattr(args, k) for k in PORSI_DEFAULT})
+    gpkg_path, excel_path = write_pair(gpkg, master, args.output, args.nama or f"sls_{args.jumlah}")
+    print(f"{gpkg_path} ({len(gpkg)} fitur), {excel_path} ({len(master)} baris) "
+          f"dalam {time.perf_counter() - mulai:.1f} detik")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
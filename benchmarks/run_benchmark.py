@@ -0,0 +1,166 @@
+"""Benchmark pipeline pengecekan per fase pada data sintetis 10k/100k/1M baris.
+
+Contoh:
+    python benchmarks/run_benchmark.py
+    python benchmarks/run_benchmark.py --ukuran 10000 100000 --ulang 3
+    python benchmarks/run_benchmark.py --bandingkan benchmarks/hasil/bench_lama.json
+
+Setiap ukuran dijalankan di proses baru agar peak RSS tidak tercampur.
+Fase yang diukur: load (baca Excel dan GeoPackage), index (prepare_master
+dan prepare_gpkg), compare, summarize (ringkasan dan laporan digit/duplikasi)
+dan export (CSV, serta Parquet jika pyarrow tersedia). Hasil ditulis ke
+JSON agar dapat dibandingkan antar run.
+"""
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+FOLDER = Path(__file__).resolve().parent
+sys.path.insert(0, str(FOLDER.parent))
+
+import pandas as pd  # noqa: E402
+
+import generate_sls  # noqa: E402
+import sls_checker  # noqa: E402
+import sls_profil  # noqa: E402
+
+UKURAN_DEFAULT = (10000, 100000, 1000000)
+FASE = ('load', 'index', 'compare', 'summarize', 'export')
+
+
+def siapkan_data(jumlah, folder, seed, porsi):
+    """Pakai data yang sudah ada jika parameternya sama; jika belum, buat baru."""
+    kunci = hashlib.sha1(json.dumps([seed, porsi], sort_keys=True).encode()).hexdigest()[:8]
+    nama = f"sls_{jumlah}_{kunci}"
+    gpkg_path, excel_path = Path(folder) / f"{nama}.gpkg", Path(folder) / f"{nama}.xlsx"
+    if not (gpkg_path.exists() and excel_path.exists()):
+        print(f"Membuat data sintetis {jumlah} baris...")
+        gpkg, master = generate_sls.generate(jumlah, seed, **porsi)
+        generate_sls.write_pair(gpkg, master, folder, nama)
+    return gpkg_path, excel_path
+
+
+def ukur_sekali(gpkg_path, excel_path):
+    """Jalankan seluruh fase satu kali; kembalikan detik per fase dan info baris."""
+    waktu = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        mulai = time.perf_counter()
+        df_master = sls_checker.read_master_excel(excel_path)
+        waktu['load_excel'] = time.perf_counter() - mulai
+        mulai = time.perf_counter()
+        df_gpkg = sls_checker.read_gpkg_attributes(str(gpkg_path))
+        waktu['load_gpkg'] = time.perf_counter() - mulai
+        waktu['load'] = waktu['load_excel'] + waktu['load_gpkg']
+
+        mulai = time.perf_counter()
+        master = sls_checker.prepare_master(df_master)
+        gpkg = sls_checker.prepare_gpkg(df_gpkg)
+        waktu['index'] = time.perf_counter() - mulai
+
+        mulai = time.perf_counter()
+        hasil = sls_checker.compare(master, gpkg)
+        waktu['compare'] = time.perf_counter() - mulai
+
+        mulai = time.perf_counter()
+        ringkasan = sls_checker.summarize(hasil)
+        laporan = sls_checker.build_report_rows(master, gpkg, hasil)
+        waktu['summarize'] = time.perf_counter() - mulai
+
+        mulai = time.perf_counter()
+        sls_checker.write_csv(hasil, laporan, Path(tmp) / 'hasil.csv')
+        waktu['export_csv'] = time.perf_counter() - mulai
+        waktu['export'] = waktu['export_csv']
+        try:
+            mulai = time.perf_counter()
+            sls_checker.write_parquet(hasil, laporan, Path(tmp) / 'hasil.parquet')
+            waktu['export_parquet'] = time.perf_counter() - mulai
+        except ImportError:
+            pass
+
+    info = {'baris_gpkg': len(df_gpkg), 'baris_master': len(df_master), 'baris_hasil': len(hasil),
+            'ketidakcocokan': ringkasan['ketidakcocokan']}
+    return waktu, info
+
+
+def ukur(gpkg_path, excel_path, ulang):
+    """Dijalankan di proses terpisah: waktu terbaik dari beberapa ulangan dan peak RSS."""
+    semua = []
+    for _ in range(ulang):
+        waktu, info = ukur_sekali(gpkg_path, excel_path)
+        semua.append(waktu)
+    terbaik = {fase: round(min(w[fase] for w in semua), 4) for fase in semua[0]}
+    return {**info, 'detik': terbaik, 'total_detik': round(sum(terbaik[f] for f in FASE), 4),
+            'peak_rss_mb': sls_profil.peak_rss_mb()}
+
+
+def bandingkan(lama, baru):
+    """Cetak perbandingan detik per fase antara dua file hasil benchmark."""
+    print(f"{'ukuran':>9} {'fase':<15} {'lama':>9} {'baru':>9} {'rasio':>7}")
+    for ukuran, hasil_baru in baru['hasil'].items():
+        hasil_lama = lama['hasil'].get(ukuran)
+        if not hasil_lama:
+            continue
+        for fase, detik in list(hasil_baru['detik'].items()) + [('TOTAL', hasil_baru['total_detik'])]:
+            detik_lama = hasil_lama['total_detik'] if fase == 'TOTAL' else hasil_lama['detik'].get(fase)
+            if detik_lama is None:
+                continue
+            rasio = detik / detik_lama if detik_lama else float('nan')
+            print(f"{ukuran:>9} {fase:<15} {detik_lama:>9.3f} {detik:>9.3f} {rasio:>6.2f}x")
+        print(f"{ukuran:>9} {'peak_rss_mb':<15} {hasil_lama['peak_rss_mb'] or 0:>9.0f} {hasil_baru['peak_rss_mb'] or 0:>9.0f}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark per fase pengecekan konsistensi SLS.")
+    parser.add_argument('--ukuran', type=int, nargs='+', default=list(UKURAN_DEFAULT),
+                        help="Jumlah baris data sintetis (default: 10000 100000 1000000)")
+    parser.add_argument('--ulang', type=int, default=1, help="Jumlah ulangan per ukuran; diambil waktu terbaik")
+    parser.add_argument('--data', default=str(FOLDER / 'data'), help="Folder data sintetis (dipakai ulang)")
+    parser.add_argument('--output', help="File JSON hasil (default: benchmarks/hasil/bench_<waktu>.json)")
+    parser.add_argument('--bandingkan', metavar='JSON', help="Bandingkan hasil run ini dengan file JSON sebelumnya")
+    parser.add_argument('--seed', type=int, default=0)
+    for kunci, nilai in generate_sls.PORSI_DEFAULT.items():
+        parser.add_argument(f"--{kunci.replace('_', '-')}", type=float, default=nilai, dest=kunci,
+                            help=f"Porsi baris pada data sintetis (default: {nilai})")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    porsi = {k: getattr(args, k) for k in generate_sls.PORSI_DEFAULT}
+
+    laporan = {
+        'waktu': datetime.now().isoformat(timespec='seconds'),
+        'lingkungan': {'python': platform.python_version(), 'pandas': pd.__version__,
+                       'platform': platform.platform(), 'cpu': platform.processor() or platform.machine()},
+        'parameter': {'seed': args.seed, 'ulang': args.ulang, 'porsi': porsi},
+        'hasil': {},
+    }
+    for jumlah in args.ukuran:
+        gpkg_path, excel_path = siapkan_data(jumlah, args.data, args.seed, porsi)
+        # Proses baru per ukuran agar peak RSS milik ukuran ini saja
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            hasil = pool.submit(ukur, str(gpkg_path), str(excel_path), args.ulang).result()
+        laporan['hasil'][str(jumlah)] = hasil
+        rincian = ', '.join(f"{fase} {hasil['detik'][fase]:.2f}" for fase in FASE)
+        rss = f"{hasil['peak_rss_mb']:.0f} MB" if hasil['peak_rss_mb'] else "n/a"
+        print(f"{jumlah:>9} baris: {hasil['total_detik']:.2f} detik ({rincian}), peak RSS {rss}")
+
+    output = Path(args.output) if args.output else FOLDER / 'hasil' / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(laporan, indent=2), encoding='utf-8')
+    print(f"Hasil disimpan ke: {output}")
+
+    if args.bandingkan:
+        bandingkan(json.loads(Path(args.bandingkan).read_text(encoding='utf-8')), laporan)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
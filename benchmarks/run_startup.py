@@ -0,0 +1,91 @@
+"""Ukur waktu cold start GUI: sampai jendela tampil dan sampai modul pengecekan siap.
+
+Contoh:
+    python benchmarks/run_startup.py
+    python benchmarks/run_startup.py --ulang 10 --exe "dist/Aplikasi Pengecek Konsistensi Data SLS.exe"
+    python benchmarks/run_startup.py --bandingkan benchmarks/hasil/startup_lama.json
+
+Aplikasi dijalankan dengan SLS_UKUR_STARTUP=<file> sehingga menulis waktu
+startup-nya (detik sejak gui_checker_app mulai diimpor) sebagai JSON ke file
+itu lalu keluar (build tanpa konsol tidak punya stdout). Waktu
+proses total (termasuk start interpreter, atau ekstraksi pada build
+PyInstaller) diukur dari luar. Di server tanpa layar, jalankan dengan
+QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+FOLDER = Path(__file__).resolve().parent
+APLIKASI = FOLDER.parent / 'gui_checker_app.py'
+UKURAN = ('jendela', 'modul', 'proses')
+
+
+def ukur_sekali(perintah):
+    """Jalankan aplikasi sekali; kembalikan detik 'jendela', 'modul', dan 'proses'."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path_ukur = Path(tmp) / 'startup.json'
+        env = dict(os.environ, SLS_UKUR_STARTUP=str(path_ukur))
+        mulai = time.perf_counter()
+        subprocess.run(perintah, env=env, capture_output=True, timeout=300, check=True)
+        proses = time.perf_counter() - mulai
+        waktu = json.loads(path_ukur.read_text(encoding='utf-8'))
+    return {**waktu, 'proses': proses}
+
+
+def bandingkan(lama, baru):
+    print(f"{'ukuran':<8} {'lama':>9} {'baru':>9} {'rasio':>7}")
+    for nama in UKURAN:
+        detik_lama, detik = lama['median_detik'].get(nama), baru['median_detik'].get(nama)
+        if detik_lama and detik is not None:
+            print(f"{nama:<8} {detik_lama:>9.3f} {detik:>9.3f} {detik / detik_lama:>6.2f}x")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark waktu cold start GUI pengecekan SLS.")
+    parser.add_argument('--ulang', type=int, default=5, help="Jumlah start; dilaporkan median (default: 5)")
+    parser.add_argument('--exe', help="Ukur build PyInstaller ini, bukan gui_checker_app.py")
+    parser.add_argument('--output', help="File JSON hasil (default: benchmarks/hasil/startup_<waktu>.json)")
+    parser.add_argument('--bandingkan', metavar='JSON', help="Bandingkan hasil run ini dengan file JSON sebelumnya")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    perintah = [args.exe] if args.exe else [sys.executable, str(APLIKASI)]
+
+    semua = []
+    for ke in range(args.ulang):
+        waktu = ukur_sekali(perintah)
+        semua.append(waktu)
+        print(f"start {ke + 1}: " + ", ".join(f"{nama} {waktu[nama]:.2f}" for nama in UKURAN if nama in waktu))
+
+    laporan = {
+        'waktu': datetime.now().isoformat(timespec='seconds'),
+        'lingkungan': {'python': platform.python_version(), 'platform': platform.platform()},
+        'perintah': perintah,
+        'median_detik': {nama: round(statistics.median(w[nama] for w in semua), 4) for nama in UKURAN},
+        'semua': semua,
+    }
+    print("median: " + ", ".join(f"{nama} {detik:.2f} detik" for nama, detik in laporan['median_detik'].items()))
+
+    output = Path(args.output) if args.output else FOLDER / 'hasil' / f"startup_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(laporan, indent=2), encoding='utf-8')
+    print(f"Hasil disimpan ke: {output}")
+
+    if args.bandingkan:
+        bandingkan(json.loads(Path(args.bandingkan).read_text(encoding='utf-8')), laporan)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
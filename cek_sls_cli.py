@@ -0,0 +1,332 @@
+"""Runner baris perintah (tanpa GUI) untuk pengecekan konsistensi data SLS.
+
+Contoh:
+    python cek_sls_cli.py --pasangan kab3201.gpkg master3201.xlsx --output hasil/
+    python cek_sls_cli.py --folder data_kabupaten/ --master master_prov.xlsx
+    python cek_sls_cli.py --folder data_kabupaten/ --master master_prov.xlsx --paralel 16 --partisi kec
+    python cek_sls_cli.py --folder folder_bersama/ --master master_prov.xlsx --pantau
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import sls_cache
+import sls_checker
+import sls_pantau
+import sls_profil
+import sls_riwayat
+import sls_spasial
+
+
+def _excel_pasangan(gpkg_path, master_path=None):
+    """Master Excel untuk satu GeoPackage: master_path, atau file .xlsx/.xls dengan nama (stem) yang sama."""
+    if master_path:
+        return Path(master_path)
+    kandidat = [gpkg_path.with_suffix(ext) for ext in ('.xlsx', '.xls')]
+    return next((p for p in kandidat if p.exists()), kandidat[0])
+
+
+def _cari_pasangan_folder(folder, master_path=None):
+    """Pasangkan setiap .gpkg di folder dengan Master Excel (lihat _excel_pasangan)."""
+    return [(gpkg_path, _excel_pasangan(gpkg_path, master_path)) for gpkg_path in sorted(Path(folder).glob('*.gpkg'))]
+
+
+def _path_laporan(gpkg_path, output_dir, fmt='csv'):
+    folder = Path(output_dir) if output_dir else gpkg_path.parent
+    return folder / f"{gpkg_path.stem}_hasil_cek.{fmt}"
+
+
+def check_pair(gpkg_path, excel_path, output_path, master=None, streaming=False, progress=None,
+               master_loader=None, history=None, spatial=False):
+    """Cek satu pasangan file dan tulis laporannya; kembalikan ringkasan.
+
+    Tanpa ``master``, Master Excel dimuat bersamaan dengan GeoPackage
+    (kecuali mode streaming yang membutuhkan Master sebelum pass kedua).
+    Jika ``history`` (sls_riwayat.HistoryStore) diberikan, hasil juga
+    disimpan ke riwayat; mode streaming tidak menyimpan hasil di memori
+    sehingga tidak dicatat. Dengan ``spatial``, hasil cek spasial
+    (sls_spasial) ditambahkan ke baris laporan dan ringkasannya dicetak;
+    jika cek spasial gagal, laporan atribut tetap ditulis.
+    """
+    mulai = time.perf_counter()
+    muat_master = master_loader or (lambda: sls_checker.load_master(str(excel_path), progress))
+    if streaming:
+        master = master if master is not None else muat_master()
+        return sls_checker.run_streaming(str(gpkg_path), master, str(output_path), progress=progress)
+    hasil, laporan = sls_checker.run_check(str(gpkg_path), progress=progress, master=master,
+                                           master_loader=muat_master)
+    if spatial:
+        try:
+            masalah, ringkasan_spasial = sls_spasial.check_spatial(str(gpkg_path), progress=progress)
+        except Exception as e:
+            # Cek spasial hanya pelengkap: kegagalannya tidak membuang hasil cek atribut
+            print(f"  Cek spasial gagal, laporan dibuat tanpa cek spasial: {e}")
+        else:
+            laporan = list(laporan) + sls_spasial.build_spatial_rows(masalah, ringkasan_spasial)
+            for line in sls_spasial.format_spatial_summary(ringkasan_spasial):
+                print(f"  {line.strip()}")
+    sls_checker.export_results(hasil, str(output_path), laporan)
+    ringkasan = sls_checker.summarize(hasil)
+    if history is not None:
+        history.record_run(hasil, gpkg_path, excel_path, laporan, ringkasan,
+                           'penuh', time.perf_counter() - mulai)
+    return ringkasan
+
+
+def _muat_master(excel_path, args, progress=None):
+    if args.tanpa_cache:
+        return sls_checker.load_master(str(excel_path), progress)
+    return sls_cache.MasterCache().load(str(excel_path), progress)
+
+
+def _profiler(args):
+    """RunProfiler sesuai opsi --profil/--cprofile/--tracemalloc (atau SLS_PROFIL)."""
+    pengaturan = sls_profil.settings_from_env()
+    return sls_profil.RunProfiler(cprofile=args.cprofile or pengaturan['cprofile'],
+                                  tracemalloc=args.tracemalloc or pengaturan['tracemalloc'])
+
+
+def _laporkan_profil(profiler, args, output_path):
+    """Tulis <laporan>_profil.json jika diminta dan cetak bagian Performance pada mode verbose."""
+    if args.profil or args.cprofile or args.tracemalloc:
+        path = sls_profil.save_report(profiler, output_path.parent, f"{output_path.stem}_profil")
+        if path:
+            print(f"  Laporan performa: {path}")
+    if args.verbose:
+        for line in profiler.format_lines():
+            print(f"  {line}", file=sys.stderr)
+
+
+def _cetak_ringkasan(ringkasan, detik, output_path):
+    print(f"  Total {ringkasan['total']}, sesuai {ringkasan['sesuai']}, "
+          f"ketidakcocokan {ringkasan['ketidakcocokan']} ({detik:.1f} detik) -> {output_path}")
+
+
+def run_watch(args):
+    """Mode --pantau: cek ulang GeoPackage di --folder setiap kali file berubah, hingga dihentikan (Ctrl+C).
+
+    Index Master tetap di memori di antara pengecekan. Saat mulai, GeoPackage
+    yang laporannya lebih baru dari file itu sendiri dan dari Master
+    pasangannya tidak dicek ulang.
+    """
+    progress = (lambda pesan: print(f"  {pesan}", file=sys.stderr)) if args.verbose else None
+    masters = sls_pantau.MasterPool(lambda excel_path: _muat_master(excel_path, args, progress))
+    watcher = sls_pantau.FolderWatcher(args.folder, debounce=args.jeda)
+    for gpkg_path in sorted(Path(args.folder).glob('*.gpkg')):
+        laporan = _path_laporan(gpkg_path, args.output, args.format)
+        excel_path = _excel_pasangan(gpkg_path, args.master)
+        # Laporan masih berlaku jika lebih baru dari GeoPackage dan Master pasangannya
+        sumber = [p.stat().st_mtime_ns for p in (gpkg_path, excel_path) if p.exists()]
+        if laporan.exists() and laporan.stat().st_mtime_ns >= max(sumber):
+            watcher.mark_checked(gpkg_path, sls_cache.file_signature(gpkg_path))
+    riwayat = sls_riwayat.HistoryStore(args.riwayat_db) if args.riwayat and not args.streaming else None
+
+    def cek(gpkg_path):
+        excel_path = _excel_pasangan(gpkg_path, args.master)
+        print(f"[{datetime.now():%H:%M:%S}] [{gpkg_path.name}] vs [{excel_path.name}]")
+        is_valid, message = sls_checker.validate_files(str(gpkg_path), str(excel_path))
+        if not is_valid:
+            print(f"  ERROR: {message}")
+            return
+        mulai = time.perf_counter()
+        output_path = _path_laporan(gpkg_path, args.output, args.format)
+        profiler = _profiler(args)
+        try:
+            with profiler.activate():
+                master = masters.get(excel_path)
+                ringkasan = check_pair(gpkg_path, excel_path, output_path, master=master, streaming=args.streaming,
+                                       progress=progress, history=riwayat,
+                                       spatial=args.spasial)
+        except Exception as e:
+            print(f"  ERROR: {sls_checker.error_message(e)}")
+            return
+        _cetak_ringkasan(ringkasan, time.perf_counter() - mulai, output_path)
+        _laporkan_profil(profiler, args, output_path)
+
+    print(f"Memantau {Path(args.folder).resolve()} (Ctrl+C untuk berhenti)...")
+    try:
+        watcher.run(cek)
+    except KeyboardInterrupt:
+        print("\nMode pantau dihentikan.")
+    finally:
+        if riwayat is not None:
+            riwayat.close()
+    return 0
+
+
+def run_parallel_batch(pasangan, args):
+    """Mode --paralel: satu laporan gabungan per Master Excel."""
+    per_master = {}
+    for gpkg_path, excel_path in pasangan:
+        is_valid, message = sls_checker.validate_files(str(gpkg_path), str(excel_path))
+        if not is_valid:
+            print(f"[{gpkg_path.name}] ERROR: {message}")
+            continue
+        per_master.setdefault(excel_path.resolve(), []).append(gpkg_path)
+
+    gagal = len(pasangan) - sum(len(daftar) for daftar in per_master.values())
+    for excel_path, gpkg_paths in per_master.items():
+        print(f"[{excel_path.name}] {len(gpkg_paths)} GeoPackage, {args.paralel} proses")
+        folder = Path(args.output) if args.output else excel_path.parent
+        output_path = folder / f"{excel_path.stem}_hasil_gabungan.{args.format}"
+        mulai = time.perf_counter()
+        # Fase di dalam proses worker tidak terekam; waktu per partisi ada di _waktu_partisi.csv
+        profiler = _profiler(args)
+        try:
+            with profiler.activate():
+                master = _muat_master(excel_path, args)
+                with sls_profil.phase("Pengecekan paralel"):
+                    hasil, laporan, waktu = sls_checker.run_parallel(
+                        gpkg_paths, master, max_workers=args.paralel, partition_level=args.partisi,
+                        progress=lambda pesan: print(f"  {pesan}"))
+                sls_checker.export_results(hasil, str(output_path), laporan)
+                pd.DataFrame(waktu).to_csv(folder / f"{excel_path.stem}_waktu_partisi.csv", index=False)
+                if args.riwayat:
+                    with sls_riwayat.HistoryStore(args.riwayat_db) as riwayat:
+                        riwayat.record_run(hasil, gpkg_paths[0] if len(gpkg_paths) == 1 else None, excel_path,
+                                           laporan, mode='paralel', detik=time.perf_counter() - mulai)
+        except Exception as e:
+            print(f"  ERROR: {sls_checker.error_message(e)}")
+            gagal += len(gpkg_paths)
+            continue
+        _laporkan_profil(profiler, args, output_path)
+        ringkasan = sls_checker.summarize(hasil)
+        print(f"  Total {ringkasan['total']}, sesuai {ringkasan['sesuai']}, "
+              f"ketidakcocokan {ringkasan['ketidakcocokan']} "
+              f"({time.perf_counter() - mulai:.1f} detik) -> {output_path}")
+
+    print(f"\nSelesai: {len(pasangan) - gagal} berhasil, {gagal} gagal.")
+    return 1 if gagal else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Cek konsistensi data SLS (GeoPackage vs Master Excel) tanpa GUI."
+    )
+    parser.add_argument('--pasangan', nargs=2, action='append', default=[], metavar=('GPKG', 'EXCEL'),
+                        help="Pasangan file GeoPackage dan Master Excel (boleh diulang)")
+    parser.add_argument('--folder', help="Folder berisi file .gpkg per kabupaten")
+    parser.add_argument('--master', help="Master Excel untuk semua GeoPackage di --folder "
+                                         "(default: file .xlsx dengan nama yang sama)")
+    parser.add_argument('--output', help="Folder laporan (default: di samping tiap file .gpkg)")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'xlsx'], default='csv',
+                        help="Format laporan (default: csv; xlsx berisi satu sheet per kategori status)")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Baca GeoPackage per batch dan tulis hasil langsung ke CSV")
+    parser.add_argument('--paralel', type=int, metavar='N',
+                        help="Cek semua GeoPackage per Master dengan N proses dan gabungkan ke satu laporan")
+    parser.add_argument('--partisi', choices=sorted(sls_checker.PANJANG_PREFIX),
+                        help="Dengan --paralel: pecah tiap GeoPackage per awalan idsubsls (prov/kab/kec/desa)")
+    parser.add_argument('--spasial', action='store_true',
+                        help="Tambahkan cek spasial: overlap, celah, geometri tidak valid, sub-SLS di luar induk")
+    parser.add_argument('--pantau', action='store_true',
+                        help="Pantau --folder terus-menerus dan cek ulang setiap GeoPackage yang berubah; "
+                             "laporan ditulis di samping file (Ctrl+C untuk berhenti)")
+    parser.add_argument('--jeda', type=float, default=sls_pantau.JEDA_STABIL, metavar='DETIK',
+                        help=f"Dengan --pantau: file dicek setelah tidak berubah selama DETIK "
+                             f"(default: {sls_pantau.JEDA_STABIL:g})")
+    parser.add_argument('--tanpa-cache', action='store_true',
+                        help="Selalu baca ulang Master Excel, jangan pakai cache index di disk")
+    parser.add_argument('--riwayat', action='store_true',
+                        help="Simpan hasil setiap run ke database riwayat lokal (lihat sls_riwayat.py)")
+    parser.add_argument('--riwayat-db', metavar='FILE',
+                        help="File database riwayat (default: riwayat.sqlite di folder cache)")
+    parser.add_argument('--profil', action='store_true',
+                        help="Tulis laporan waktu dan memori per fase ke <laporan>_profil.json")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="Seperti --profil, ditambah capture cProfile (<laporan>_profil.pstats)")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="Seperti --profil, ditambah puncak alokasi memori Python per fase (tracemalloc)")
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help="Tampilkan pesan progress dan bagian Performance")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.pantau and (not args.folder or args.pasangan or args.paralel):
+        print("--pantau membutuhkan --folder dan tidak dapat dipakai bersama --pasangan atau --paralel.",
+              file=sys.stderr)
+        return 2
+
+    if args.partisi and not args.paralel:
+        print("--partisi hanya dapat dipakai bersama --paralel.", file=sys.stderr)
+        return 2
+
+    pasangan = [(Path(g), Path(e)) for g, e in args.pasangan]
+    if args.folder:
+        pasangan.extend(_cari_pasangan_folder(args.folder, args.master))
+    if not pasangan and not args.pantau:
+        print("Tidak ada file yang dicek. Gunakan --pasangan atau --folder.", file=sys.stderr)
+        return 2
+    if args.output:
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+
+    if args.streaming and args.format != 'csv':
+        print("--streaming hanya menulis laporan CSV.", file=sys.stderr)
+        return 2
+
+    if args.spasial and (args.streaming or args.paralel):
+        print("--spasial tidak dapat dipakai bersama --streaming atau --paralel.", file=sys.stderr)
+        return 2
+
+    if args.pantau:
+        return run_watch(args)
+
+    if args.paralel:
+        return run_parallel_batch(pasangan, args)
+
+    progress = (lambda pesan: print(f"  {pesan}", file=sys.stderr)) if args.verbose else None
+    if args.riwayat and args.streaming:
+        print("Catatan: mode streaming tidak dicatat ke riwayat.", file=sys.stderr)
+    riwayat = sls_riwayat.HistoryStore(args.riwayat_db) if args.riwayat and not args.streaming else None
+    gagal = 0
+    master, master_path = None, None
+    for gpkg_path, excel_path in pasangan:
+        print(f"[{gpkg_path.name}] vs [{excel_path.name}]")
+        is_valid, message = sls_checker.validate_files(str(gpkg_path), str(excel_path))
+        if not is_valid:
+            print(f"  ERROR: {message}")
+            gagal += 1
+            continue
+
+        mulai = time.perf_counter()
+        output_path = _path_laporan(gpkg_path, args.output, args.format)
+        try:
+            # Master yang sama tidak dibaca ulang untuk pasangan berikutnya; untuk
+            # pasangan pertama, Master dimuat bersamaan dengan GeoPackage-nya
+            if excel_path.resolve() != master_path:
+                master, master_path = None, excel_path.resolve()
+            dimuat = {}
+
+            def muat_master():
+                dimuat['master'] = _muat_master(excel_path, args, progress)
+                return dimuat['master']
+
+            profiler = _profiler(args)
+            with profiler.activate():
+                ringkasan = check_pair(gpkg_path, excel_path, output_path, master=master,
+                                       streaming=args.streaming, progress=progress,
+                                       master_loader=muat_master, history=riwayat, spatial=args.spasial)
+            master = dimuat.get('master', master)
+        except Exception as e:
+            print(f"  ERROR: {sls_checker.error_message(e)}")
+            gagal += 1
+            continue
+
+        _cetak_ringkasan(ringkasan, time.perf_counter() - mulai, output_path)
+        _laporkan_profil(profiler, args, output_path)
+
+    if riwayat is not None:
+        riwayat.close()
+    print(f"\nSelesai: {len(pasangan) - gagal} berhasil, {gagal} gagal.")
+    return 1 if gagal else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
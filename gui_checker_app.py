@@ -1,28 +1,99 @@
-import sys
+import time
+_MULAI = time.perf_counter()  # acuan waktu startup, sebelum PyQt6 diimpor
+
+import json
+import multiprocessing
 import os
-import pandas as pd
-import geopandas as gpd
+import sys
+import sqlite3
+import threading
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QLineEdit, QTextEdit, QFileDialog, QMessageBox,
-    QProgressBar
+    QProgressBar, QCheckBox, QComboBox, QSplitter, QTableView
+)
+from PyQt6.QtCore import (
+    QThread, pyqtSignal, Qt, QAbstractTableModel, QIdentityProxyModel, QModelIndex, QTimer
 )
-from PyQt6.QtCore import QThread, pyqtSignal, Qt
 from pathlib import Path
-from collections import Counter
+
+import sls_profil
+
+# Modul pengecekan (numpy, pandas, dst.) diimpor setelah jendela tampil, lihat load_modules()
+np = sls_cache = sls_checker = sls_riwayat = sls_spasial = None
+_kunci_modul = threading.Lock()
+
+
+def load_modules():
+    """Impor modul pengecekan sekali; aman dipanggil dari thread mana pun."""
+    global np, sls_cache, sls_checker, sls_riwayat, sls_spasial
+    with _kunci_modul:
+        if sls_spasial is None:
+            import numpy as np
+            import sls_cache
+            import sls_checker
+            import sls_riwayat
+            import sls_spasial  # terakhir: penanda semua modul sudah siap
+
+
+class PreloadWorker(QThread):
+    """Impor modul pengecekan di latar belakang agar klik pertama tidak menunggu pandas."""
+    loaded = pyqtSignal(float)  # detik
+    failed = pyqtSignal(str)
+
+    def run(self):
+        mulai = time.perf_counter()
+        try:
+            load_modules()
+        except ImportError as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(time.perf_counter() - mulai)
+
 
 # --- Worker Thread untuk proses pengecekan ---
 class CheckWorker(QThread):
     progress = pyqtSignal(str)
-    finished = pyqtSignal(list)
+    progress_value = pyqtSignal(str, int, float)  # fase, persen, baris/detik (maks. 10x per detik)
+    finished = pyqtSignal(object)  # sls_checker.CheckResult
+    stream_finished = pyqtSignal(dict)
+    cancelled = pyqtSignal()
     error = pyqtSignal(str)
+    performance = pyqtSignal(list)  # baris bagian Performance setelah run selesai
+    done = pyqtSignal()  # paling akhir (setelah riwayat disimpan); UI baru diaktifkan lagi di sini
 
-    def __init__(self, gpkg_path, excel_path):
+    def __init__(self, gpkg_path, excel_path, output_path=None, history=False, spatial=False, session=None):
         super().__init__()
         self.gpkg_path = gpkg_path
         self.excel_path = excel_path
+        self.output_path = output_path  # Jika diisi: mode streaming, hasil langsung ditulis ke file
+        self.history = history  # Simpan hasil ke database riwayat lokal (sls_riwayat)
+        self.spatial = spatial  # Tambahkan cek overlap/celah/geometri (sls_spasial) ke laporan
+        self.session = session  # sls_cache.SessionCache milik MainWindow: data file yang tidak berubah dipakai ulang
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Minta proses berhenti; dicek di antara batch sehingga file ditutup dengan benar."""
+        self.cancel_event.set()
 
     def run(self):
+        try:
+            load_modules()  # biasanya sudah selesai oleh PreloadWorker
+            # Waktu dan memori per fase; cProfile/tracemalloc diaktifkan lewat SLS_PROFIL
+            profiler = sls_profil.RunProfiler(**sls_profil.settings_from_env())
+            with profiler.activate():
+                selesai = self._run()
+            if selesai:
+                lines = profiler.format_lines()
+                path = sls_profil.save_report(profiler, sls_cache.default_cache_dir() / 'profil')
+                if path:
+                    lines.append(f"Laporan performa (JSON): {path}")
+                self.performance.emit(lines)
+        finally:
+            self.done.emit()
+
+    def _run(self):
+        """Jalankan pengecekan; True jika selesai dan hasil sudah dikirim."""
         try:
             # Validasi file exists
             if not Path(self.excel_path).exists():
@@ -32,274 +103,210 @@ class CheckWorker(QThread):
                 self.error.emit("File GeoPackage tidak ditemukan")
                 return
 
-            # --- LANGKAH 1: Baca file Excel ---
-            self.progress.emit("Membaca file Master Excel...")
-            df_master = pd.read_excel(self.excel_path, dtype={'idsubsls': str, 'kdsubsls': str, 'nmsls': str})
-            master_data = {}
-            master_digit_issues = []
-            master_duplicates = []
-            
-            # Cek duplikasi di Excel
-            excel_idsubsls_list = [str(row['idsubsls']).strip() for index, row in df_master.iterrows() if pd.notna(row['idsubsls'])]
-            excel_duplicate_counter = Counter(excel_idsubsls_list)
-            excel_duplicates = {id: count for id, count in excel_duplicate_counter.items() if count > 1}
-            
-            for index, row in df_master.iterrows():
-                idsubsls_key = str(row['idsubsls']).strip()
-                kdsubsls_master = str(row['kdsubsls']).strip()
-                
-                # Cek apakah idsubsls duplikat di Excel
-                is_excel_duplicate = idsubsls_key in excel_duplicates
-                if is_excel_duplicate:
-                    master_duplicates.append(idsubsls_key)
-                
-                # Cek digit kdsubsls di Excel
-                if kdsubsls_master != '' and kdsubsls_master != '00':
-                    if len(kdsubsls_master) > 2:
-                        master_digit_issues.append(f"Excel - ID: {idsubsls_key}: kdsubsls '{kdsubsls_master}' lebih dari 2 digit")
-                    elif len(kdsubsls_master) == 1:
-                        master_digit_issues.append(f"Excel - ID: {idsubsls_key}: kdsubsls '{kdsubsls_master}' hanya 1 digit")
-                
-                # Normalisasi kdsubsls untuk penyimpanan
-                kdsubsls_normalized = kdsubsls_master
-                if kdsubsls_master == '0':
-                    kdsubsls_normalized = '00'
-                elif len(kdsubsls_master) == 1 and kdsubsls_master != '0':
-                    kdsubsls_normalized = f"0{kdsubsls_master}"
-                
-                master_data[idsubsls_key] = {
-                    'nmsls': str(row['nmsls']).strip(),
-                    'kdsubsls': kdsubsls_normalized,  # Simpan yang sudah dinormalisasi
-                    'kdsubsls_original': kdsubsls_master,  # Simpan versi original untuk comparison
-                    'is_duplicate': is_excel_duplicate  # Flag duplikasi
-                }
-            
-            self.progress.emit(f"Berhasil memuat {len(master_data)} baris dari Master Excel.")
-            if master_digit_issues:
-                self.progress.emit(f"Peringatan: Ditemukan {len(master_digit_issues)} issue digit kdsubsls di Excel")
-            if excel_duplicates:
-                self.progress.emit(f"Peringatan: Ditemukan {len(excel_duplicates)} IDSUBSLS duplikat di Excel")
-
-            # --- LANGKAH 2: Baca file GeoPackage ---
-            self.progress.emit("Membaca file GeoPackage...")
-            gdf = gpd.read_file(self.gpkg_path, dtype={'idsubsls': str, 'kdsubsls': str, 'nmsls': str})
-            self.progress.emit(f"Berhasil memuat {len(gdf)} baris dari GeoPackage.")
-
-            all_results = []
-            gpkg_idsubsls_set = set()
-            gpkg_digit_issues = []
-            gpkg_duplicates = []
-            
-            # Cek duplikasi di GPKG
-            gpkg_idsubsls_list = [str(feature.get('idsubsls')).strip() for index, feature in gdf.iterrows() 
-                                 if feature.get('idsubsls') and pd.notna(feature.get('idsubsls'))]
-            gpkg_duplicate_counter = Counter(gpkg_idsubsls_list)
-            gpkg_duplicates = {id: count for id, count in gpkg_duplicate_counter.items() if count > 1}
-            
-            self.progress.emit("Memulai perbandingan data...")
-            total_rows = len(gdf)
-            
-            # --- LANGKAH 3 & 4: Iterasi, Normalisasi, dan Bandingkan ---
-            for index, feature in gdf.iterrows():
-                # Update progress
-                if index % 100 == 0:
-                    progress_percent = int((index / total_rows) * 100)
-                    self.progress.emit(f"Memproses data: {progress_percent}% ({index}/{total_rows})")
-                
-                gpkg_idsubsls = feature.get('idsubsls')
-                if not gpkg_idsubsls or pd.isna(gpkg_idsubsls):
-                    continue
-                
-                gpkg_idsubsls = str(gpkg_idsubsls).strip()
-                gpkg_idsubsls_set.add(gpkg_idsubsls)
-                
-                # Cek apakah idsubsls duplikat di GPKG
-                is_gpkg_duplicate = gpkg_idsubsls in gpkg_duplicates
-                if is_gpkg_duplicate:
-                    gpkg_duplicates[gpkg_idsubsls] = gpkg_duplicates.get(gpkg_idsubsls, 0) + 1
-                
-                gpkg_nmsls = str(feature.get('nmsls', '') or '').strip()
-                gpkg_kdsubsls_raw = feature.get('kdsubsls', '')
-                
-                # Handle NaN values and normalize kdsubsls from GPKG
-                if pd.isna(gpkg_kdsubsls_raw) or gpkg_kdsubsls_raw == '':
-                    gpkg_kdsubsls_normalized = '00'
-                    gpkg_kdsubsls_original = ''
-                else:
-                    gpkg_kdsubsls_str = str(gpkg_kdsubsls_raw).strip()
-                    gpkg_kdsubsls_original = gpkg_kdsubsls_str
-                    
-                    # Cek digit kdsubsls di GPKG
-                    if gpkg_kdsubsls_str != '' and gpkg_kdsubsls_str != '00':
-                        if len(gpkg_kdsubsls_str) > 2:
-                            gpkg_digit_issues.append(f"GPKG - ID: {gpkg_idsubsls}: kdsubsls '{gpkg_kdsubsls_str}' lebih dari 2 digit")
-                        elif len(gpkg_kdsubsls_str) == 1:
-                            gpkg_digit_issues.append(f"GPKG - ID: {gpkg_idsubsls}: kdsubsls '{gpkg_kdsubsls_str}' hanya 1 digit")
-                    
-                    # Normalisasi kdsubsls GPKG
-                    if gpkg_kdsubsls_str == '0':
-                        gpkg_kdsubsls_normalized = '00'
-                    elif len(gpkg_kdsubsls_str) == 1 and gpkg_kdsubsls_str != '0':
-                        gpkg_kdsubsls_normalized = f"0{gpkg_kdsubsls_str}"
-                    else:
-                        gpkg_kdsubsls_normalized = gpkg_kdsubsls_str
-
-                result_row = {
-                    'IDSUB_SLS': gpkg_idsubsls,
-                    'NMSLS_GPKG': gpkg_nmsls,
-                    'NMSLS_MASTER': '',
-                    'KDSUBSLS_GPKG': gpkg_kdsubsls_normalized,  # Gunakan yang sudah dinormalisasi
-                    'KDSUBSLS_GPKG_ORIGINAL': gpkg_kdsubsls_original,  # Simpan original untuk referensi
-                    'KDSUBSLS_MASTER': '',
-                    'KDSUBSLS_MASTER_ORIGINAL': '',
-                    'Duplikasi_idsubsls': 'Duplikat' if is_gpkg_duplicate else 'Non Duplikasi',
-                    'Status': ''
-                }
-
-                if gpkg_idsubsls in master_data:
-                    master_record = master_data[gpkg_idsubsls]
-                    result_row['NMSLS_MASTER'] = master_record['nmsls']
-                    result_row['KDSUBSLS_MASTER'] = master_record['kdsubsls']  # Yang sudah dinormalisasi
-                    result_row['KDSUBSLS_MASTER_ORIGINAL'] = master_record['kdsubsls_original']  # Original dari Excel
-                    
-                    # Jika duplikat di Excel, update status duplikasi
-                    if master_record['is_duplicate']:
-                        result_row['Duplikasi_idsubsls'] = 'Duplikat (Excel & GPKG)' if is_gpkg_duplicate else 'Duplikat (Excel)'
-                    elif is_gpkg_duplicate:
-                        result_row['Duplikasi_idsubsls'] = 'Duplikat (GPKG)'
-                    
-                    issues = []
-                    if gpkg_nmsls != master_record['nmsls']:
-                        issues.append('Beda NMSLS')
-                    
-                    # Bandingkan yang sudah dinormalisasi
-                    if gpkg_kdsubsls_normalized != master_record['kdsubsls']:
-                        issues.append('Beda KdSubSLS')
-                    
-                    result_row['Status'] = ', '.join(issues) if issues else 'Sesuai'
+            mulai = time.perf_counter()
+            meter = sls_checker.ProgressThrottle(self.progress_value.emit)
+            cancel = self.cancel_event
+
+            # Index Master diambil dari memori sesi, atau dari cache disk jika Excel tidak berubah
+            def muat_master():
+                def dari_disk():
+                    return sls_cache.MasterCache().load(self.excel_path, self.progress.emit)
+                if self.session is None:
+                    return dari_disk()
+                return self.session.get('Master', self.excel_path, dari_disk, self.progress.emit)
+
+            def muat_gpkg():
+                return self.session.get('GeoPackage', self.gpkg_path, lambda: sls_checker.load_gpkg(
+                    self.gpkg_path, self.progress.emit, meter, cancel), self.progress.emit)
+
+            gpkg_loader = muat_gpkg if self.session is not None else None
+
+            if self.output_path:
+                meter("Membaca Master Excel", 0, 1)
+                master = muat_master()
+                meter("Membaca Master Excel", 1, 1)
+                sls_checker.check_cancel(cancel)
+                ringkasan = sls_checker.run_streaming(self.gpkg_path, master, self.output_path,
+                                                      progress=self.progress.emit, meter=meter, cancel=cancel)
+                self.stream_finished.emit(ringkasan)
+                return True
+
+            # Master dan GeoPackage dimuat bersamaan
+            hasil, laporan = sls_checker.run_check(self.gpkg_path, progress=self.progress.emit, meter=meter,
+                                                   cancel=cancel, master_loader=muat_master, gpkg_loader=gpkg_loader)
+            sls_checker.check_cancel(cancel)
+            if self.spatial:
+                try:
+                    masalah, ringkasan_spasial = sls_spasial.check_spatial(
+                        self.gpkg_path, progress=self.progress.emit, meter=meter, cancel=cancel)
+                except sls_checker.CheckCancelled:
+                    raise
+                except Exception as e:
+                    # Cek spasial hanya pelengkap: kegagalannya tidak membuang hasil cek atribut
+                    self.progress.emit(f"Cek spasial gagal, laporan dibuat tanpa cek spasial: {e}")
                 else:
-                    result_row['Status'] = 'Tidak Ditemukan di Master'
-                    if is_gpkg_duplicate:
-                        result_row['Duplikasi_idsubsls'] = 'Duplikat (GPKG)'
-                
-                all_results.append(result_row)
-            
-            # --- LANGKAH 5: Cek data yang hilang di GPKG ---
-            self.progress.emit("Mengecek data yang hilang di GeoPackage...")
-            master_idsubsls_set = set(master_data.keys())
-            missing_in_gpkg = master_idsubsls_set - gpkg_idsubsls_set
-            
-            for idsubsls in missing_in_gpkg:
-                master_record = master_data[idsubsls]
-                duplikasi_status = 'Duplikat (Excel)' if master_record['is_duplicate'] else 'Non Duplikasi'
-                
-                all_results.append({
-                    'IDSUB_SLS': idsubsls,
-                    'NMSLS_GPKG': '',
-                    'NMSLS_MASTER': master_record['nmsls'],
-                    'KDSUBSLS_GPKG': '',
-                    'KDSUBSLS_GPKG_ORIGINAL': '',
-                    'KDSUBSLS_MASTER': master_record['kdsubsls'],
-                    'KDSUBSLS_MASTER_ORIGINAL': master_record['kdsubsls_original'],
-                    'Duplikasi_idsubsls': duplikasi_status,
-                    'Status': 'Tidak Ditemukan di GeoPackage'
-                })
-
-            # Simpan informasi digit issues ke results
-            digit_issues_result = {
-                'IDSUB_SLS': '=== ISSUE DIGIT KDSUBSLS ===',
-                'NMSLS_GPKG': '',
-                'NMSLS_MASTER': '',
-                'KDSUBSLS_GPKG': f"Total issue GPKG: {len(gpkg_digit_issues)}",
-                'KDSUBSLS_GPKG_ORIGINAL': '',
-                'KDSUBSLS_MASTER': f"Total issue Excel: {len(master_digit_issues)}",
-                'KDSUBSLS_MASTER_ORIGINAL': '',
-                'Duplikasi_idsubsls': '',
-                'Status': 'Laporan Digit'
-            }
-            all_results.append(digit_issues_result)
-            
-            # Tambahkan detail issues ke results
-            for issue in gpkg_digit_issues[:10]:  # Batasi agar tidak terlalu panjang
-                all_results.append({
-                    'IDSUB_SLS': issue.split(':')[1].strip(),
-                    'NMSLS_GPKG': '',
-                    'NMSLS_MASTER': '',
-                    'KDSUBSLS_GPKG': issue,
-                    'KDSUBSLS_GPKG_ORIGINAL': '',
-                    'KDSUBSLS_MASTER': '',
-                    'KDSUBSLS_MASTER_ORIGINAL': '',
-                    'Duplikasi_idsubsls': '',
-                    'Status': 'Issue Digit GPKG'
-                })
-            
-            for issue in master_digit_issues[:10]:  # Batasi agar tidak terlalu panjang
-                all_results.append({
-                    'IDSUB_SLS': issue.split(':')[1].strip(),
-                    'NMSLS_GPKG': '',
-                    'NMSLS_MASTER': '',
-                    'KDSUBSLS_GPKG': '',
-                    'KDSUBSLS_GPKG_ORIGINAL': '',
-                    'KDSUBSLS_MASTER': issue,
-                    'KDSUBSLS_MASTER_ORIGINAL': '',
-                    'Duplikasi_idsubsls': '',
-                    'Status': 'Issue Digit Excel'
-                })
-            
-            # Simpan informasi duplikasi ke results
-            duplikasi_result = {
-                'IDSUB_SLS': '=== LAPORAN DUPLIKASI IDSUB_SLS ===',
-                'NMSLS_GPKG': '',
-                'NMSLS_MASTER': '',
-                'KDSUBSLS_GPKG': f"Total duplikat GPKG: {len(gpkg_duplicates)}",
-                'KDSUBSLS_GPKG_ORIGINAL': '',
-                'KDSUBSLS_MASTER': f"Total duplikat Excel: {len(excel_duplicates)}",
-                'KDSUBSLS_MASTER_ORIGINAL': '',
-                'Duplikasi_idsubsls': '',
-                'Status': 'Laporan Duplikasi'
-            }
-            all_results.append(duplikasi_result)
-            
-            # Tambahkan detail duplikasi GPKG
-            for duplicate_id, count in list(gpkg_duplicates.items())[:10]:
-                all_results.append({
-                    'IDSUB_SLS': duplicate_id,
-                    'NMSLS_GPKG': f"Duplikat {count} kali di GPKG",
-                    'NMSLS_MASTER': '',
-                    'KDSUBSLS_GPKG': '',
-                    'KDSUBSLS_GPKG_ORIGINAL': '',
-                    'KDSUBSLS_MASTER': '',
-                    'KDSUBSLS_MASTER_ORIGINAL': '',
-                    'Duplikasi_idsubsls': 'Duplikat (GPKG)',
-                    'Status': 'Detail Duplikasi'
-                })
-            
-            # Tambahkan detail duplikasi Excel
-            for duplicate_id, count in list(excel_duplicates.items())[:10]:
-                all_results.append({
-                    'IDSUB_SLS': duplicate_id,
-                    'NMSLS_GPKG': '',
-                    'NMSLS_MASTER': f"Duplikat {count} kali di Excel",
-                    'KDSUBSLS_GPKG': '',
-                    'KDSUBSLS_GPKG_ORIGINAL': '',
-                    'KDSUBSLS_MASTER': '',
-                    'KDSUBSLS_MASTER_ORIGINAL': '',
-                    'Duplikasi_idsubsls': 'Duplikat (Excel)',
-                    'Status': 'Detail Duplikasi'
-                })
-
-            self.finished.emit(all_results)
-
-        except FileNotFoundError as e:
-            self.error.emit(f"File tidak ditemukan: {e}")
-        except PermissionError as e:
-            self.error.emit(f"Tidak ada izin untuk membaca file: {e}")
-        except pd.errors.EmptyDataError:
-            self.error.emit("File Excel kosong")
-        except KeyError as e:
-            self.error.emit(f"Error: Kolom tidak ditemukan. Pastikan file Anda memiliki kolom 'idsubsls', 'nmsls', dan 'kdsubsls'. Detail: {e}")
+                    laporan = list(laporan) + sls_spasial.build_spatial_rows(masalah, ringkasan_spasial)
+                    for line in sls_spasial.format_spatial_summary(ringkasan_spasial):
+                        self.progress.emit(line)
+            result = sls_checker.CheckResult(hasil, laporan)
+            self.finished.emit(result)
+            if self.history:
+                # Disimpan setelah hasil dikirim agar tampilan hasil tidak menunggu penulisan riwayat
+                self.save_history(result, time.perf_counter() - mulai)
+            return True
+
+        except sls_checker.CheckCancelled:
+            self.cancelled.emit()
         except Exception as e:
-            self.error.emit(f"Terjadi error: {str(e)}")
+            self.error.emit(sls_checker.error_message(e))
+
+    def save_history(self, result, detik):
+        try:
+            with sls_riwayat.HistoryStore() as riwayat:
+                run_id = riwayat.record_run(result.data, self.gpkg_path, self.excel_path, result.report,
+                                            result.summary, 'penuh', detik)
+        except (sqlite3.Error, OSError) as e:
+            # Riwayat hanya pelengkap: kegagalan menyimpan tidak menggagalkan pengecekan
+            self.progress.emit(f"Riwayat tidak tersimpan: {e}")
+            return
+        self.progress.emit(f"Hasil disimpan ke riwayat (run #{run_id}).")
+
+
+# --- Model tabel hasil (virtual, baris diambil bertahap) ---
+class ResultTableModel(QAbstractTableModel):
+    """Model tabel di atas CheckResult.data tanpa menyalin baris ke objek Qt.
+
+    Tampilan disimpan sebagai array posisi baris (``_urutan``); sort dan
+    filter status cukup menyusun ulang array itu secara vektor. Baris
+    diberikan ke view per BARIS_PER_AMBIL lewat canFetchMore/fetchMore.
+    """
+    BARIS_PER_AMBIL = 1000
+
+    def __init__(self, data=None, parent=None):
+        super().__init__(parent)
+        self._kolom = []
+        self._urutan = ()
+        self._dimuat = 0
+        self._status = None
+        self._sort = (-1, Qt.SortOrder.AscendingOrder)
+        if data is not None:
+            self.set_data(data)
+
+    def set_data(self, data):
+        self.beginResetModel()
+        # Kolom categorical disimpan sebagai (kode, kategori), kolom teks sebagai array aslinya
+        self._kolom = []
+        for nama in sls_checker.KOLOM_HASIL:
+            kolom = data[nama]
+            if hasattr(kolom, 'cat'):
+                self._kolom.append((kolom.cat.codes.to_numpy(), np.asarray(kolom.cat.categories, dtype=object)))
+            else:
+                self._kolom.append((kolom.to_numpy(dtype=object), None))
+        self._susun_ulang()
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._kolom = []
+        self._susun_ulang()
+        self.endResetModel()
+
+    def _nilai(self, kolom, posisi):
+        nilai, kategori = self._kolom[kolom]
+        return nilai[posisi] if kategori is None else kategori[nilai[posisi]]
+
+    def _kunci_sort(self, kolom, posisi):
+        nilai, kategori = self._kolom[kolom]
+        if kategori is None:
+            return nilai[posisi]
+        # Urutkan kategori menurut abjad, bukan urutan kodenya
+        peringkat = np.empty(len(kategori), dtype=np.int64)
+        peringkat[np.argsort(kategori)] = np.arange(len(kategori))
+        return peringkat[nilai[posisi]]
+
+    def _susun_ulang(self):
+        """Hitung ulang _urutan dari filter status dan sort yang aktif."""
+        if not self._kolom:
+            self._urutan, self._dimuat = (), 0
+            return
+        urutan = np.arange(len(self._kolom[0][0]))
+        if self._status is not None:
+            kode, kategori = self._kolom[sls_checker.KOLOM_HASIL.index('Status')]
+            cocok = np.flatnonzero(kategori == self._status)
+            urutan = np.flatnonzero(kode == cocok[0]) if len(cocok) else urutan[:0]
+        kolom, arah = self._sort
+        if kolom >= 0 and len(urutan):
+            urutan = urutan[np.argsort(self._kunci_sort(kolom, urutan), kind='stable')]
+            if arah == Qt.SortOrder.DescendingOrder:
+                urutan = urutan[::-1]
+        self._urutan = urutan
+        self._dimuat = min(len(urutan), self.BARIS_PER_AMBIL)
+
+    def set_status_filter(self, status):
+        """Tampilkan hanya baris dengan Status tertentu (None = semua)."""
+        self.beginResetModel()
+        self._status = status
+        self._susun_ulang()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.beginResetModel()
+        self._sort = (column, order)
+        self._susun_ulang()
+        self.endResetModel()
+
+    def matching_rows(self):
+        """Jumlah baris yang lolos filter (termasuk yang belum diambil view)."""
+        return len(self._urutan)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._dimuat
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or sls_checker is None:
+            return 0
+        return len(sls_checker.KOLOM_HASIL)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._dimuat < len(self._urutan)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        tambahan = min(self.BARIS_PER_AMBIL, len(self._urutan) - self._dimuat)
+        if tambahan <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._dimuat, self._dimuat + tambahan - 1)
+        self._dimuat += tambahan
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return str(self._nilai(index.column(), self._urutan[index.row()]))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return sls_checker.KOLOM_HASIL[section]
+        # Nomor baris mengikuti urutan hasil asli, tidak berubah saat di-sort/filter
+        return str(self._urutan[section] + 1)
+
+
+class ResultProxyModel(QIdentityProxyModel):
+    """Proxy untuk QTableView: sort dan filter status diteruskan ke ResultTableModel.
+
+    QSortFilterProxyModel memanggil lessThan/filterAcceptsRow per baris dari
+    Python, terlalu lambat untuk jutaan baris; di sini keduanya dikerjakan
+    model sumber dengan operasi numpy.
+    """
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def set_status_filter(self, status):
+        self.sourceModel().set_status_filter(status)
 
 
 # --- Main Application Window ---
@@ -309,8 +316,11 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Aplikasi Pengecek Konsistensi Data SLS")
         self.setGeometry(100, 100, 800, 600)
         
-        self.results_data = []
+        self.result = None  # sls_checker.CheckResult dari pengecekan terakhir
         self.worker = None
+        self.preload = None
+        self.session_cache = None  # sls_cache.SessionCache, dibuat saat pengecekan pertama
+        self.waktu_startup = {}  # detik sejak proses mulai: 'jendela' tampil, 'modul' pengecekan siap
 
         # Central Widget and Layout
         central_widget = QWidget()
@@ -347,7 +357,7 @@ class MainWindow(QMainWindow):
         action_layout = QHBoxLayout()
         self.run_check_btn = QPushButton("Mulai Pengecekan")
         self.run_check_btn.clicked.connect(self.run_check)
-        self.export_csv_btn = QPushButton("Ekspor Hasil ke CSV")
+        self.export_csv_btn = QPushButton("Ekspor Hasil (CSV/Parquet/XLSX)")
         self.export_csv_btn.clicked.connect(self.export_csv)
         self.export_csv_btn.setEnabled(False)
         self.cancel_btn = QPushButton("Batalkan")
@@ -358,11 +368,45 @@ class MainWindow(QMainWindow):
         action_layout.addWidget(self.export_csv_btn)
         action_layout.addWidget(self.cancel_btn)
 
+        # Mode streaming untuk GeoPackage yang sangat besar
+        self.streaming_check = QCheckBox("Mode streaming untuk file besar (hasil langsung ditulis ke CSV)")
+        # Riwayat tidak aktif secara default: setiap run menyimpan semua baris hasil (hingga 20 run)
+        self.history_check = QCheckBox("Simpan hasil ke riwayat lokal (tidak berlaku untuk mode streaming)")
+        self.spatial_check = QCheckBox("Cek spasial (overlap, celah, geometri tidak valid, sub-SLS di luar induk)")
+
         # Log/Results Display
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
         self.results_text.setFontFamily("Courier New")
 
+        # Tabel hasil lengkap (virtual) dengan filter status
+        self.result_model = ResultTableModel()
+        self.result_proxy = ResultProxyModel()
+        self.result_proxy.setSourceModel(self.result_model)
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_proxy)
+        self.result_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.result_table.setSortingEnabled(True)
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("Semua Status", None)  # kategori ditambahkan di on_modules_loaded
+        self.status_filter.currentIndexChanged.connect(self.filter_status)
+        self.filter_label = QLabel("")
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filter Status:"))
+        filter_layout.addWidget(self.status_filter)
+        filter_layout.addWidget(self.filter_label)
+        filter_layout.addStretch()
+        table_widget = QWidget()
+        table_layout = QVBoxLayout(table_widget)
+        table_layout.setContentsMargins(0, 0, 0, 0)
+        table_layout.addLayout(filter_layout)
+        table_layout.addWidget(self.result_table)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.results_text)
+        splitter.addWidget(table_widget)
+
         # Progress Bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -370,10 +414,41 @@ class MainWindow(QMainWindow):
         # Add all widgets to main layout
         main_layout.addLayout(file_layout)
         main_layout.addLayout(action_layout)
+        main_layout.addWidget(self.streaming_check)
+        main_layout.addWidget(self.history_check)
+        main_layout.addWidget(self.spatial_check)
         main_layout.addWidget(QLabel("Log Hasil Pengecekan:"))
-        main_layout.addWidget(self.results_text)
+        main_layout.addWidget(splitter)
         main_layout.addWidget(self.progress_bar)
 
+    def start_preload(self):
+        """Dipanggil sekali setelah jendela tampil: catat waktu startup lalu muat modul di latar belakang."""
+        self.waktu_startup['jendela'] = time.perf_counter() - _MULAI
+        self.statusBar().showMessage("Memuat modul pengecekan...")
+        self.preload = PreloadWorker()
+        self.preload.loaded.connect(self.on_modules_loaded)
+        self.preload.failed.connect(self.on_modules_failed)
+        self.preload.start()
+
+    def on_modules_loaded(self, detik):
+        self.waktu_startup['modul'] = time.perf_counter() - _MULAI
+        for status in sls_checker.KATEGORI_STATUS:
+            self.status_filter.addItem(status, status)
+        if self.result is None:
+            self.result_model.clear()  # header kolom hasil baru tersedia sekarang
+        self.statusBar().showMessage(f"Siap. Jendela tampil dalam {self.waktu_startup['jendela']:.2f} detik, "
+                                     f"modul pengecekan dimuat dalam {detik:.2f} detik.", 10000)
+        path_ukur = os.environ.get('SLS_UKUR_STARTUP')
+        if path_ukur:
+            # Dipakai benchmarks/run_startup.py: tulis waktu startup ke file lalu keluar
+            # (bukan stdout, yang tidak ada pada build PyInstaller tanpa konsol)
+            Path(path_ukur).write_text(json.dumps({k: round(v, 4) for k, v in self.waktu_startup.items()}),
+                                       encoding='utf-8')
+            QApplication.instance().quit()
+
+    def on_modules_failed(self, error_message):
+        self.statusBar().showMessage(f"Modul pengecekan gagal dimuat: {error_message}")
+
     def browse_gpkg(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Pilih File GeoPackage", "", "GeoPackage Files (*.gpkg)")
         if file_path:
@@ -386,15 +461,8 @@ class MainWindow(QMainWindow):
 
     def validate_files(self, gpkg_path, excel_path):
         """Validasi keberadaan dan format file"""
-        if not os.path.exists(gpkg_path):
-            return False, "File GeoPackage tidak ditemukan"
-        if not os.path.exists(excel_path):
-            return False, "File Excel tidak ditemukan"
-        if not gpkg_path.lower().endswith('.gpkg'):
-            return False, "File GeoPackage harus berekstensi .gpkg"
-        if not excel_path.lower().endswith(('.xlsx', '.xls')):
-            return False, "File Excel harus berekstensi .xlsx atau .xls"
-        return True, "OK"
+        load_modules()
+        return sls_checker.validate_files(gpkg_path, excel_path)
 
     def run_check(self):
         gpkg_path = self.gpkg_path_edit.text()
@@ -410,115 +478,118 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "File Tidak Valid", message)
             return
         
+        output_path = None
+        if self.streaming_check.isChecked():
+            output_path, _ = QFileDialog.getSaveFileName(self, "Simpan Hasil CSV", "", "CSV Files (*.csv)")
+            if not output_path:
+                return
+
         # Reset UI
         self.set_ui_enabled(False)
         self.results_text.clear()
-        self.results_data = []
+        self.result = None
+        self.result_model.clear()
+        self.filter_label.setText("")
         self.export_csv_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0) # Indeterminate progress
-
-        # Start worker thread
-        self.worker = CheckWorker(gpkg_path, excel_path)
+        self.progress_bar.setValue(0)
+
+        # Start worker thread; file yang tidak berubah sejak run sebelumnya tidak dimuat ulang
+        if self.session_cache is None:
+            self.session_cache = sls_cache.SessionCache()
+        self.worker = CheckWorker(gpkg_path, excel_path, output_path,
+                                  self.history_check.isChecked(), self.spatial_check.isChecked(),
+                                  self.session_cache)
         self.worker.progress.connect(self.update_log)
+        self.worker.progress_value.connect(self.update_progress)
+        self.worker.cancelled.connect(self.on_check_cancelled)
+        self.worker.performance.connect(self.show_performance)
+        self.worker.done.connect(self.on_worker_done)
         self.worker.finished.connect(self.on_check_finished)
+        self.worker.stream_finished.connect(self.on_stream_finished)
         self.worker.error.connect(self.on_check_error)
         self.worker.start()
 
     def update_log(self, message):
         self.results_text.append(message)
 
-    def on_check_finished(self, results):
-        self.results_data = results
+    def update_progress(self, fase, persen, laju):
+        self.progress_bar.setValue(persen)
+        self.progress_bar.setFormat(f"{fase}: %p% ({laju:,.0f} baris/detik)" if laju else f"{fase}: %p%")
+
+    def on_check_finished(self, result):
+        self.result = result
         self.update_log("\n--- Pengecekan Selesai ---")
 
-        # Filter hanya hasil pengecekan data (bukan laporan digit/duplikasi)
-        data_results = [r for r in results if 'ISSUE DIGIT' not in r['IDSUB_SLS'] and 'LAPORAN DUPLIKASI' not in r['IDSUB_SLS'] and 'Issue Digit' not in r['Status'] and 'Detail Duplikasi' not in r['Status']]
-        mismatches = [row for row in data_results if row['Status'] != 'Sesuai']
-
-        # Hitung statistik
-        total = len(data_results)
-        sesuai = len([r for r in data_results if r['Status'] == 'Sesuai'])
-        tidak_ditemukan_master = len([r for r in data_results if r['Status'] == 'Tidak Ditemukan di Master'])
-        tidak_ditemukan_gpkg = len([r for r in data_results if r['Status'] == 'Tidak Ditemukan di GeoPackage'])
-        beda_nmsls = len([r for r in data_results if 'Beda NMSLS' in r['Status']])
-        beda_kdsubsls = len([r for r in data_results if 'Beda KdSubSLS' in r['Status']])
-        
-        # Hitung duplikasi
-        duplikat_gpkg = len([r for r in data_results if 'Duplikat (GPKG)' in r['Duplikasi_idsubsls']])
-        duplikat_excel = len([r for r in data_results if 'Duplikat (Excel)' in r['Duplikasi_idsubsls']])
-        duplikat_keduanya = len([r for r in data_results if 'Duplikat (Excel & GPKG)' in r['Duplikasi_idsubsls']])
-        total_duplikat = duplikat_gpkg + duplikat_excel + duplikat_keduanya
-
-        # Tampilkan summary
-        self.results_text.append(f"\n=== SUMMARY HASIL ===")
-        self.results_text.append(f"Total Data: {total}")
-        self.results_text.append(f"Data Sesuai: {sesuai}")
-        self.results_text.append(f"Tidak Ditemukan di Master: {tidak_ditemukan_master}")
-        self.results_text.append(f"Tidak Ditemukan di GeoPackage: {tidak_ditemukan_gpkg}")
-        self.results_text.append(f"Beda NMSLS: {beda_nmsls}")
-        self.results_text.append(f"Beda KdSubSLS: {beda_kdsubsls}")
-        self.results_text.append(f"Duplikat IDSUBSLS: {total_duplikat}")
-        self.results_text.append(f"  - Duplikat di GPKG: {duplikat_gpkg}")
-        self.results_text.append(f"  - Duplikat di Excel: {duplikat_excel}")
-        self.results_text.append(f"  - Duplikat di Keduanya: {duplikat_keduanya}")
-
-        if not mismatches and total_duplikat == 0:
-            self.results_text.append("\nSELAMAT! Semua data konsisten dan tidak ada duplikasi.")
-        else:
-            issues_count = len(mismatches) + total_duplikat
-            self.results_text.append(f"\nDitemukan {issues_count} masalah:")
-            
-            if mismatches:
-                self.results_text.append(f"- {len(mismatches)} ketidakcocokan data")
-                # Tampilkan beberapa contoh di log
-                for i, mismatch in enumerate(mismatches[:10], 1):
-                    self.results_text.append(f"  {i}. IDSUB_SLS {mismatch['IDSUB_SLS']}: {mismatch['Status']}")
-            
-            if total_duplikat > 0:
-                self.results_text.append(f"- {total_duplikat} duplikasi IDSUBSLS")
-                
-            if len(mismatches) > 10 or total_duplikat > 0:
-                self.results_text.append("\n(Hasil selengkapnya dapat diekspor ke CSV)")
+        # Statistik sudah dihitung di thread worker bersama hasilnya
+        self.show_summary(result.summary)
+        self.result_model.set_data(result.data)
+        self.update_filter_label()
 
+        # Tombol lain diaktifkan di on_worker_done, setelah worker selesai menyimpan riwayat
         self.export_csv_btn.setEnabled(True)
-        self.set_ui_enabled(True)
         self.progress_bar.setVisible(False)
-        self.progress_bar.setRange(0, 100)
+
+    def on_stream_finished(self, ringkasan):
+        self.update_log("\n--- Pengecekan Selesai ---")
+        self.show_summary(ringkasan, catatan="(Hasil selengkapnya sudah ditulis ke CSV)")
+        self.update_log(f"Hasil disimpan ke: {self.worker.output_path}")
+
+        self.export_csv_btn.setEnabled(False)  # Hasil tidak disimpan di memori pada mode streaming
+        self.progress_bar.setVisible(False)
+
+    def filter_status(self):
+        self.result_proxy.set_status_filter(self.status_filter.currentData())
+        self.update_filter_label()
+
+    def update_filter_label(self):
+        self.filter_label.setText(f"{self.result_model.matching_rows()} baris")
+
+    def show_summary(self, ringkasan, catatan="(Hasil selengkapnya dapat diekspor ke CSV)"):
+        """Tampilkan ringkasan hasil pengecekan di log"""
+        for line in sls_checker.format_summary(ringkasan, catatan):
+            self.results_text.append(line)
+
+    def show_performance(self, lines):
+        for line in lines:
+            self.results_text.append(line)
 
     def on_check_error(self, error_message):
-        self.set_ui_enabled(True)
         self.progress_bar.setVisible(False)
         QMessageBox.critical(self, "Error", error_message)
         self.update_log(f"ERROR: {error_message}")
 
     def export_csv(self):
-        if not self.results_data:
+        if self.result is None or not len(self.result):
             QMessageBox.information(self, "Tidak Ada Data", "Tidak ada data hasil pengecekan untuk diekspor.")
             return
 
-        file_path, _ = QFileDialog.getSaveFileName(self, "Simpan Hasil CSV", "", "CSV Files (*.csv)")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Simpan Hasil", "",
+            "CSV Files (*.csv);;Parquet Files (*.parquet);;Excel Files (*.xlsx)")
         if file_path:
             try:
-                df = pd.DataFrame(self.results_data)
-                # Pastikan kdsubsls ditampilkan dengan format yang benar
-                if 'KDSUBSLS_GPKG' in df.columns:
-                    df['KDSUBSLS_GPKG'] = df['KDSUBSLS_GPKG'].apply(lambda x: f"{x:0>2}" if str(x).isdigit() and len(str(x)) == 1 else str(x))
-                if 'KDSUBSLS_MASTER' in df.columns:
-                    df['KDSUBSLS_MASTER'] = df['KDSUBSLS_MASTER'].apply(lambda x: f"{x:0>2}" if str(x).isdigit() and len(str(x)) == 1 else str(x))
-                
-                df.to_csv(file_path, index=False)
+                profiler = sls_profil.RunProfiler()
+                with profiler.activate():
+                    self.result.export(file_path)
+                self.show_performance(profiler.format_lines())
                 QMessageBox.information(self, "Ekspor Berhasil", f"Hasil berhasil disimpan ke:\n{file_path}")
             except Exception as e:
-                QMessageBox.critical(self, "Gagal Menyimpan", f"Gagal menyimpan file CSV. Error: {e}")
+                QMessageBox.critical(self, "Gagal Menyimpan", f"Gagal menyimpan file. Error: {e}")
 
     def cancel_check(self):
         if self.worker and self.worker.isRunning():
-            self.worker.terminate()
-            self.worker.wait()
-            self.update_log("Proses dibatalkan oleh pengguna")
-            self.set_ui_enabled(True)
-            self.progress_bar.setVisible(False)
+            # Worker berhenti sendiri di batas batch berikutnya lalu mengirim sinyal cancelled
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.update_log("Membatalkan proses...")
+
+    def on_check_cancelled(self):
+        self.update_log("Proses dibatalkan oleh pengguna")
+        self.progress_bar.setVisible(False)
+
+    def on_worker_done(self):
+        self.set_ui_enabled(True)
 
     def set_ui_enabled(self, enabled):
         self.gpkg_browse_btn.setEnabled(enabled)
@@ -538,7 +609,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.StandardButton.No
             )
             if reply == QMessageBox.StandardButton.Yes:
-                self.worker.terminate()
+                self.worker.cancel()
                 self.worker.wait()
                 event.accept()
             else:
@@ -547,7 +618,10 @@ class MainWindow(QMainWindow):
             event.accept()
 
 if __name__ == '__main__':
+    # Build PyInstaller: proses worker (cek spasial paralel) menjalankan tugasnya, bukan membuka jendela baru
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    QTimer.singleShot(0, window.start_preload)
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,49 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Build .exe satu file:  pyinstaller gui_checker_app.spec
+#
+# Build satu file mengekstrak seluruh isinya ke folder sementara setiap kali
+# dijalankan, jadi setiap pustaka yang tidak dipakai menambah waktu start.
+# Modul di bawah tidak dipakai aplikasi dan dikecualikan. UPX tidak dipakai:
+# dekompresi memperlambat start dan lebih sering ditandai antivirus.
+
+EXCLUDES = [
+    # Pustaka yang ikut terdeteksi lewat import opsional pandas/geopandas
+    'tkinter', 'matplotlib', 'IPython', 'jupyter_client', 'notebook', 'scipy', 'sqlalchemy',
+    'pytest',
+    # Modul PyQt6 selain QtCore/QtGui/QtWidgets
+    'PyQt6.QtNetwork', 'PyQt6.QtQml', 'PyQt6.QtQuick', 'PyQt6.QtQuickWidgets', 'PyQt6.QtWebEngineCore',
+    'PyQt6.QtWebEngineWidgets', 'PyQt6.QtMultimedia', 'PyQt6.QtMultimediaWidgets', 'PyQt6.QtBluetooth',
+    'PyQt6.QtPositioning', 'PyQt6.QtSensors', 'PyQt6.QtSerialPort', 'PyQt6.QtSql', 'PyQt6.QtTest',
+    'PyQt6.QtPdf', 'PyQt6.QtPdfWidgets', 'PyQt6.QtSvg', 'PyQt6.QtSvgWidgets', 'PyQt6.QtOpenGL',
+    'PyQt6.QtOpenGLWidgets', 'PyQt6.QtDesigner', 'PyQt6.QtHelp', 'PyQt6.Qt3DCore',
+]
+
+a = Analysis(
+    ['gui_checker_app.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUDES,
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.datas,
+    [],
+    name='Aplikasi Pengecek Konsistensi Data SLS',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    runtime_tmpdir=None,
+    console=False,
+)
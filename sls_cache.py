@@ -0,0 +1,220 @@
+"""Cache index Master Excel (disk dan memori sesi) dan atribut GeoPackage (memori sesi)."""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+import sls_checker
+import sls_profil
+
+# Naikkan jika struktur index Master berubah agar cache lama tidak dipakai
+VERSI_CACHE = 2
+
+# Jumlah maksimum Master yang disimpan; yang paling lama tidak dipakai dihapus
+MAKS_MASTER_CACHE = 8
+
+# Batas perkiraan memori (MB) data yang disimpan SessionCache
+MAKS_MEMORI_SESI_MB = 1024
+
+
+def default_cache_dir():
+    """Folder cache per pengguna (LOCALAPPDATA di Windows, ~/.cache di tempat lain)."""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'cek_konsistensi_sls'
+
+
+def file_fingerprint(path):
+    """(path absolut, ukuran, mtime_ns) untuk deteksi perubahan file secara cepat."""
+    stat = os.stat(path)
+    return str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns
+
+
+def file_signature(path):
+    """(ukuran, mtime_ns) file beserta file -wal SQLite-nya; None jika file tidak ada.
+
+    Dipakai SessionCache dan mode pantau (sls_pantau) untuk mendeteksi perubahan tanpa hash isi.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    try:
+        wal = os.stat(f"{path}-wal")
+        tanda_wal = (wal.st_size, wal.st_mtime_ns)
+    except OSError:
+        tanda_wal = None
+    return stat.st_size, stat.st_mtime_ns, tanda_wal
+
+
+def content_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 isi file, dibaca per blok."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(chunk_size), b''):
+            digest.update(blok)
+    return digest.hexdigest()
+
+
+def _tulis_atomik(path, data):
+    """Tulis file lewat file sementara lalu os.replace agar tidak pernah setengah jadi."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class MasterCache:
+    """Cache index Master di disk, dikunci dengan path, ukuran, mtime, dan hash isi file.
+
+    Jika path, ukuran, dan mtime cocok dengan entri yang ada, hash isi tidak
+    dihitung ulang. Jika tidak cocok (file disalin atau di-touch), hash isi
+    dihitung dan entri dengan isi yang sama tetap dipakai ulang.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=MAKS_MASTER_CACHE):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_entries = max_entries
+        self.index_path = self.cache_dir / 'master_index.json'
+
+    def _baca_index(self):
+        try:
+            return json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _simpan_index(self, index):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _tulis_atomik(self.index_path, json.dumps(index, indent=1).encode('utf-8'))
+
+    def _file_entri(self, kunci):
+        return self.cache_dir / f"master_{kunci}.pkl"
+
+    def _cari_kunci(self, index, excel_path):
+        path, size, mtime_ns = file_fingerprint(excel_path)
+        for kunci, entri in index.items():
+            # Entri dari VERSI_CACHE lain tidak dipakai ulang (dibuang LRU seiring waktu)
+            if (kunci.endswith(f"_v{VERSI_CACHE}")
+                    and (entri['path'], entri['size'], entri['mtime_ns']) == (path, size, mtime_ns)):
+                return kunci, (path, size, mtime_ns)
+        return f"{content_hash(excel_path)}_v{VERSI_CACHE}", (path, size, mtime_ns)
+
+    def _buang_lama(self, index):
+        """Hapus entri yang paling lama tidak dipakai hingga jumlahnya <= max_entries."""
+        urut = sorted(index, key=lambda kunci: index[kunci]['last_used'])
+        for kunci in urut[:max(len(index) - self.max_entries, 0)]:
+            self._file_entri(kunci).unlink(missing_ok=True)
+            del index[kunci]
+
+    def load(self, excel_path, progress=None):
+        """Ambil index Master dari cache, atau baca Excel dan simpan ke cache."""
+        lapor = progress or sls_checker.silent
+        index = self._baca_index()
+        kunci, (path, size, mtime_ns) = self._cari_kunci(index, excel_path)
+
+        master = None
+        if kunci in index:
+            try:
+                with sls_profil.phase("Muat index Master dari cache"), open(self._file_entri(kunci), 'rb') as f:
+                    master = pickle.load(f)
+                lapor("Memakai index Master dari cache (Excel tidak dibaca ulang).")
+                sls_checker.report_master(master, lapor)
+            except Exception:
+                # Entri rusak atau ditulis versi pandas/numpy lain (ModuleNotFoundError, TypeError, ...):
+                # buang lalu bangun ulang dari Excel
+                master = None
+                self._file_entri(kunci).unlink(missing_ok=True)
+                lapor("Cache index Master tidak dapat dibaca, Excel dibaca ulang.")
+
+        if master is None:
+            master = sls_checker.load_master(excel_path, lapor)
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                _tulis_atomik(self._file_entri(kunci), pickle.dumps(master, protocol=pickle.HIGHEST_PROTOCOL))
+            except OSError:
+                # Cache hanya optimasi: kegagalan menulis tidak menggagalkan pengecekan
+                return master
+
+        index[kunci] = {'path': path, 'size': size, 'mtime_ns': mtime_ns, 'last_used': time.time()}
+        self._buang_lama(index)
+        try:
+            self._simpan_index(index)
+        except OSError:
+            pass
+        return master
+
+    def clear(self):
+        """Hapus seluruh cache Master."""
+        for kunci in self._baca_index():
+            self._file_entri(kunci).unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+
+
+def _perkiraan_mb(obj):
+    """Perkiraan memori DataFrame/Series (termasuk isi string) atau dict berisi keduanya."""
+    if isinstance(obj, dict):
+        return sum(_perkiraan_mb(nilai) for nilai in obj.values())
+    if isinstance(obj, pd.DataFrame):
+        return obj.memory_usage(index=True, deep=True).sum() / 2 ** 20
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.memory_usage(deep=True) / 2 ** 20
+    return sys.getsizeof(obj) / 2 ** 20
+
+
+class SessionCache:
+    """Data yang sudah dimuat (index Master, atribut GeoPackage) untuk dipakai ulang selama satu sesi.
+
+    Entri dikunci jenis data dan path absolut, dan hanya dipakai jika ukuran
+    dan mtime file (termasuk file -wal GeoPackage) belum berubah; jika satu
+    file berubah, hanya file itu yang dimuat ulang. Total perkiraan memori
+    dibatasi ``max_mb``; entri yang paling lama tidak dipakai dibuang lebih
+    dulu. Data yang dikembalikan dipakai bersama antar run dan tidak boleh
+    diubah di tempat.
+    """
+
+    def __init__(self, max_mb=MAKS_MEMORI_SESI_MB):
+        self.max_mb = max_mb
+        self._entri = OrderedDict()  # (jenis, path) -> (signature, data, mb)
+        self._kunci = threading.Lock()  # Master dan GeoPackage dimuat di dua thread
+
+    def get(self, jenis, path, loader, progress=None):
+        """Data ``jenis`` untuk ``path`` dari memori, atau hasil ``loader()`` yang lalu disimpan."""
+        kunci = (jenis, str(Path(path).resolve()))
+        # Signature diambil sebelum dimuat: perubahan selama pemuatan terdeteksi pada run berikutnya
+        tanda = file_signature(path)
+        with self._kunci:
+            entri = self._entri.get(kunci)
+            if entri is not None and entri[0] == tanda:
+                self._entri.move_to_end(kunci)
+                (progress or sls_checker.silent)(f"Memakai {jenis} dari memori sesi ({Path(path).name} tidak berubah).")
+                return entri[1]
+            self._entri.pop(kunci, None)
+
+        data = loader()
+        mb = _perkiraan_mb(data)
+        with self._kunci:
+            if mb <= self.max_mb:
+                self._entri[kunci] = (tanda, data, mb)
+                self._buang_lama()
+        return data
+
+    def _buang_lama(self):
+        """Buang entri yang paling lama tidak dipakai hingga total <= max_mb."""
+        while self._entri and self.size_mb() > self.max_mb:
+            self._entri.popitem(last=False)
+
+    def size_mb(self):
+        return sum(entri[2] for entri in self._entri.values())
+
+    def __len__(self):
+        return len(self._entri)
+
+    def clear(self):
+        with self._kunci:
+            self._entri.clear()
+
@@ -0,0 +1,1214 @@
+"""Mesin pembanding data SLS (GeoPackage vs Master Excel) berbasis operasi vektor pandas."""
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import sls_profil
+
+# Kolom atribut yang dipakai pengecekan; geometri tidak pernah dibutuhkan
+KOLOM_ATRIBUT = ('idsubsls', 'nmsls', 'kdsubsls')
+
+KOLOM_HASIL = [
+    'IDSUB_SLS', 'NMSLS_GPKG', 'NMSLS_MASTER',
+    'KDSUBSLS_GPKG', 'KDSUBSLS_GPKG_ORIGINAL',
+    'KDSUBSLS_MASTER', 'KDSUBSLS_MASTER_ORIGINAL',
+    'Duplikasi_idsubsls', 'Status', 'Jenis_Beda_NMSLS'
+]
+
+# Batas jumlah baris detail yang dimasukkan ke laporan digit/duplikasi
+BATAS_DETAIL = 10
+
+# Jumlah fitur GeoPackage per batch pada mode streaming
+UKURAN_BATCH = 50000
+
+# Selang (detik) pengecekan pembatalan saat menunggu Master Excel dan GeoPackage dimuat
+JEDA_CEK_BATAL = 0.1
+
+# Jumlah baris per blok saat ekspor, dan batas baris per sheet Excel (tanpa header)
+BARIS_PER_BLOK = 100000
+MAKS_BARIS_SHEET = 1048575
+
+# Kategori Status dan Duplikasi_idsubsls; kolom hasil disimpan sebagai categorical
+KATEGORI_STATUS = ('Sesuai', 'Beda NMSLS', 'Beda KdSubSLS', 'Beda NMSLS, Beda KdSubSLS',
+                   'Tidak Ditemukan di Master', 'Tidak Ditemukan di GeoPackage')
+KATEGORI_DUPLIKASI = ('Non Duplikasi', 'Duplikat (GPKG)', 'Duplikat (Excel)', 'Duplikat (Excel & GPKG)')
+
+# Jenis beda NMSLS; kosong jika NMSLS sama atau baris tidak berpasangan
+KATEGORI_BEDA_NMSLS = ('', 'Kosmetik', 'Substantif')
+
+# NMSLS dengan angka sama dan kemiripan (1 - jarak edit / panjang) minimal ini dianggap beda kosmetik
+BATAS_MIRIP_NMSLS = 0.85
+
+# NMSLS dipotong sepanjang ini sebelum jarak edit dihitung, agar biayanya terbatas
+MAKS_PANJANG_NMSLS = 64
+
+# Status baris laporan (bukan baris data hasil pengecekan)
+STATUS_LAPORAN = ('Laporan Digit', 'Issue Digit GPKG', 'Issue Digit Excel', 'Laporan Duplikasi', 'Detail Duplikasi',
+                  'Laporan Kandidat', 'Kandidat Master', 'Laporan Spasial', 'Issue Spasial')
+
+# Jumlah kandidat Master terdekat per idsubsls yang tidak ditemukan
+JUMLAH_KANDIDAT = 3
+
+
+# --- Helper normalisasi kolom ---
+def clean_text(kolom, pengganti_kosong='nan'):
+    """Setara str(x).strip() per sel; sel kosong (NaN/None) diganti pengganti_kosong."""
+    nilai = np.full(len(kolom), pengganti_kosong, dtype=object)
+    terisi = kolom.notna().to_numpy()
+    nilai[terisi] = kolom[terisi].astype(str).str.strip().to_numpy(dtype=object)
+    return pd.Series(nilai, index=kolom.index, dtype=object)
+
+
+def _normalisasi_kdsubsls(kdsubsls):
+    """kdsubsls 1 digit diberi awalan nol ('0' -> '00', '5' -> '05')."""
+    return kdsubsls.mask(kdsubsls.str.len() == 1, '0' + kdsubsls)
+
+
+def normalize_nmsls(nmsls):
+    """Kunci pembanding NMSLS: huruf besar, tanda baca jadi spasi, nol di depan angka dibuang.
+
+    'rt.001/rw 02', 'RT 1 RW 2' dan 'RT001 RW002' menjadi kunci yang sama 'RT 1 RW 2'.
+    """
+    # NMSLS banyak berulang (RT/RW), jadi cukup normalisasi nilai uniknya
+    kode, unik = pd.factorize(nmsls.astype(object).fillna('').astype(str))
+    teks = pd.Series(unik, dtype=object).str.upper()
+    teks = teks.str.replace(r'(?<=[^\W\d_])(?=\d)|(?<=\d)(?=[^\W\d_])', ' ', regex=True)
+    teks = teks.str.replace(r'[\W_]+', ' ', regex=True)
+    teks = teks.str.replace(r'(?<!\d)0+(?=\d)', '', regex=True)
+    return pd.Series(teks.str.strip().to_numpy(dtype=object)[kode], index=nmsls.index, dtype=object)
+
+
+def _levenshtein(a, b, ukuran=UKURAN_BATCH):
+    """Jarak edit per pasangan (a[i], b[i]) dengan NumPy, vektor atas semua pasangan per blok.
+
+    Baris DP diperbarui per karakter a; rantai sisipan dalam satu baris
+    dihitung sekaligus dengan minimum kumulatif, sehingga loop Python
+    hanya sepanjang string, bukan per pasangan.
+    """
+    jarak = np.empty(len(a), dtype=np.int64)
+    for mulai in range(0, len(a), ukuran):
+        blok_a, blok_b = a[mulai:mulai + ukuran], b[mulai:mulai + ukuran]
+        la, lb = np.char.str_len(blok_a), np.char.str_len(blok_b)
+        kode_a = blok_a.astype(f'U{max(la.max(), 1)}').view(np.uint32).reshape(len(blok_a), -1)
+        kode_b = blok_b.astype(f'U{max(lb.max(), 1)}').view(np.uint32).reshape(len(blok_b), -1)
+        j = np.arange(kode_b.shape[1] + 1, dtype=np.int32)
+        baris = np.broadcast_to(j, (len(blok_a), len(j))).copy()
+        hasil = lb.astype(np.int64)  # a kosong: jarak = panjang b
+        for i in range(1, kode_a.shape[1] + 1):
+            ganti = baris[:, :-1] + (kode_a[:, i - 1:i] != kode_b)
+            sementara = np.empty_like(baris)
+            sementara[:, 0] = i
+            np.minimum(ganti, baris[:, 1:] + 1, out=sementara[:, 1:])
+            baris = np.minimum.accumulate(sementara - j, axis=1) + j
+            selesai = np.flatnonzero(la == i)
+            hasil[selesai] = baris[selesai, lb[selesai]]
+        jarak[mulai:mulai + ukuran] = hasil
+    return jarak
+
+
+def nmsls_similarity(a, b):
+    """Kemiripan 0..1 per pasangan (1 - jarak edit / panjang terpanjang).
+
+    Memakai rapidfuzz jika terpasang; jika tidak, NumPy (_levenshtein).
+    """
+    a = np.asarray(a, dtype=str)
+    b = np.asarray(b, dtype=str)
+    try:
+        from rapidfuzz.distance import Levenshtein
+        from rapidfuzz.process import cpdist
+    except ImportError:
+        panjang = np.maximum(np.char.str_len(a), np.char.str_len(b))
+        return 1 - _levenshtein(a, b) / np.maximum(panjang, 1)
+    return cpdist(a, b, scorer=Levenshtein.normalized_similarity, workers=-1)
+
+
+def classify_nmsls(kunci_gpkg, kunci_master):
+    """Kode KATEGORI_BEDA_NMSLS (1 kosmetik, 2 substantif) untuk pasangan NMSLS yang berbeda.
+
+    Kosmetik jika kunci normalisasinya sama, atau angkanya sama (RT/RW)
+    dan kemiripan ejaannya minimal BATAS_MIRIP_NMSLS; selain itu substantif.
+    """
+    def angka(kunci):
+        return kunci.str.replace(r'\D+', ' ', regex=True).str.strip().to_numpy(dtype=object)
+
+    sama = (kunci_gpkg.to_numpy(dtype=object) == kunci_master.to_numpy(dtype=object))
+    kode = np.where(sama, 1, 2).astype(np.int8)
+    periksa = np.flatnonzero(~sama & (angka(kunci_gpkg) == angka(kunci_master)))
+    if len(periksa):
+        pendek_gpkg = kunci_gpkg.iloc[periksa].str.slice(0, MAKS_PANJANG_NMSLS)
+        pendek_master = kunci_master.iloc[periksa].str.slice(0, MAKS_PANJANG_NMSLS)
+        kode[periksa[nmsls_similarity(pendek_gpkg, pendek_master) >= BATAS_MIRIP_NMSLS]] = 1
+    return kode
+
+
+def _issue_digit(ids, kdsubsls, sumber):
+    """Hitung issue digit kdsubsls dan susun pesan untuk beberapa contoh pertama."""
+    panjang = kdsubsls.str.len()
+    bermasalah = (kdsubsls != '') & (kdsubsls != '00') & ((panjang > 2) | (panjang == 1))
+    jumlah = int(bermasalah.sum())
+    contoh = []
+    for id_, kd in zip(ids[bermasalah].head(BATAS_DETAIL), kdsubsls[bermasalah].head(BATAS_DETAIL)):
+        keterangan = 'lebih dari 2 digit' if len(kd) > 2 else 'hanya 1 digit'
+        contoh.append(f"{sumber} - ID: {id_}: kdsubsls '{kd}' {keterangan}")
+    return jumlah, contoh
+
+
+def _hitung_duplikat(ids):
+    """Kembalikan Series id -> jumlah kemunculan untuk id yang muncul lebih dari sekali."""
+    return ids[ids.duplicated(keep=False)].value_counts(sort=False)
+
+
+def silent(*_):
+    """Callback progress default: abaikan pesan."""
+
+
+# --- Progress numerik dan pembatalan ---
+class CheckCancelled(Exception):
+    """Pengecekan dihentikan oleh pengguna."""
+
+
+def check_cancel(cancel):
+    """Lempar CheckCancelled jika event pembatalan (threading.Event) sudah di-set."""
+    if cancel is not None and cancel.is_set():
+        raise CheckCancelled("Proses dibatalkan oleh pengguna")
+
+
+def _tunggu(future, cancel):
+    """Hasil ``future``; pembatalan dicek setiap JEDA_CEK_BATAL detik selama menunggu."""
+    while not wait([future], timeout=JEDA_CEK_BATAL).done:
+        check_cancel(cancel)
+    return future.result()
+
+
+class ProgressThrottle:
+    """Teruskan progress numerik paling banyak ``hz`` kali per detik.
+
+    Dipanggil sebagai ``meter(fase, selesai, total)``; callback menerima
+    ``(fase, persen, baris_per_detik)``. Awal fase baru dan akhir fase
+    (selesai == total) selalu diteruskan.
+    """
+
+    def __init__(self, callback, hz=10):
+        self.callback = callback
+        self.jeda = 1.0 / hz
+        self._fase = None
+        self._mulai = self._terakhir = 0.0
+
+    def __call__(self, fase, selesai, total):
+        sekarang = time.perf_counter()
+        if fase != self._fase:
+            self._fase, self._mulai = fase, sekarang
+        elif selesai < total and sekarang - self._terakhir < self.jeda:
+            return
+        self._terakhir = sekarang
+        persen = min(int(selesai * 100 / total), 100) if total else 100
+        # Fase satu langkah (total 1) tidak punya laju baris yang berarti
+        laju = selesai / (sekarang - self._mulai) if total > 1 and sekarang > self._mulai else 0.0
+        self.callback(fase, persen, laju)
+
+
+# --- Pembacaan atribut GeoPackage tanpa geometri ---
+def _buka_gpkg(gpkg_path):
+    """Buka GeoPackage sebagai database SQLite read-only."""
+    uri = Path(gpkg_path).resolve().as_uri() + '?mode=ro'
+    return sqlite3.connect(uri, uri=True)
+
+
+def _tabel_fitur(conn):
+    """Nama tabel fitur pertama yang terdaftar di gpkg_contents."""
+    row = conn.execute(
+        "SELECT table_name FROM gpkg_contents WHERE data_type = 'features' ORDER BY rowid LIMIT 1"
+    ).fetchone()
+    if row is None:
+        raise sqlite3.DatabaseError("GeoPackage tidak memiliki tabel fitur")
+    return row[0]
+
+
+def _kolom_tersedia(conn, tabel, columns):
+    ada = {info[1] for info in conn.execute(f'PRAGMA table_info("{tabel}")')}
+    return [kol for kol in columns if kol in ada]
+
+
+def _baca_gpkg_sqlite(gpkg_path, columns):
+    with closing(_buka_gpkg(gpkg_path)) as conn:
+        tabel = _tabel_fitur(conn)
+        tersedia = _kolom_tersedia(conn, tabel, columns)
+        if not tersedia:
+            # Tidak ada kolom yang cocok: cukup jumlah barisnya saja
+            jumlah = conn.execute(f'SELECT COUNT(*) FROM "{tabel}"').fetchone()[0]
+            return pd.DataFrame(index=pd.RangeIndex(jumlah))
+        daftar = ', '.join(f'"{kol}"' for kol in tersedia)
+        return pd.read_sql_query(f'SELECT {daftar} FROM "{tabel}" ORDER BY rowid', conn)
+
+
+def iter_gpkg_batches(gpkg_path, batch_size=UKURAN_BATCH, columns=KOLOM_ATRIBUT):
+    """Baca atribut GeoPackage per batch berdasarkan rentang rowid.
+
+    Setiap batch diambil dengan ``WHERE rowid > terakhir LIMIT n`` sehingga
+    memori hanya sebesar satu batch, tanpa biaya OFFSET yang makin mahal.
+    """
+    try:
+        conn = _buka_gpkg(gpkg_path)
+        tabel = _tabel_fitur(conn)
+    except sqlite3.DatabaseError:
+        df = read_gpkg_attributes(gpkg_path, columns)
+        for mulai in range(0, len(df), batch_size):
+            yield df.iloc[mulai:mulai + batch_size].reset_index(drop=True)
+        return
+
+    with closing(conn):
+        daftar = ''.join(f', "{kol}"' for kol in _kolom_tersedia(conn, tabel, columns))
+        query = f'SELECT rowid AS _rowid{daftar} FROM "{tabel}" WHERE rowid > ? ORDER BY rowid LIMIT ?'
+        terakhir = -1
+        while True:
+            batch = pd.read_sql_query(query, conn, params=(terakhir, batch_size))
+            if batch.empty:
+                return
+            terakhir = int(batch['_rowid'].iloc[-1])
+            yield batch.drop(columns='_rowid')
+
+
+def _baca_gpkg_bertahap(gpkg_path, columns, meter, cancel):
+    total = count_gpkg_rows(gpkg_path)
+    bagian, dibaca = [], 0
+    meter("Membaca GeoPackage", 0, total)
+    for batch in iter_gpkg_batches(gpkg_path, columns=columns):
+        check_cancel(cancel)
+        bagian.append(batch)
+        dibaca += len(batch)
+        meter("Membaca GeoPackage", dibaca, total)
+    if not bagian:
+        return read_gpkg_attributes(gpkg_path, columns)
+    return pd.concat(bagian, ignore_index=True)
+
+
+def count_gpkg_rows(gpkg_path):
+    """Jumlah fitur di tabel GeoPackage tanpa membaca isinya."""
+    try:
+        with closing(_buka_gpkg(gpkg_path)) as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM "{_tabel_fitur(conn)}"').fetchone()[0]
+    except sqlite3.DatabaseError:
+        return len(read_gpkg_attributes(gpkg_path, ('idsubsls',)))
+
+
+def read_gpkg_attributes(gpkg_path, columns=KOLOM_ATRIBUT, meter=None, cancel=None):
+    """Baca hanya kolom atribut GeoPackage tanpa mengurai geometri.
+
+    Tabel fitur dibaca langsung lewat sqlite3; jika file bukan GeoPackage
+    SQLite yang standar, jatuh kembali ke geopandas dengan ignore_geometry.
+    Jika ``meter`` atau ``cancel`` diberikan, tabel dibaca per batch agar
+    progress dapat dilaporkan dan pembatalan dicek di antara batch.
+    """
+    if meter is not None or cancel is not None:
+        return _baca_gpkg_bertahap(gpkg_path, columns, meter or silent, cancel)
+    try:
+        return _baca_gpkg_sqlite(gpkg_path, columns)
+    except sqlite3.DatabaseError:
+        import geopandas as gpd
+        df = gpd.read_file(gpkg_path, ignore_geometry=True)
+        return df[[kol for kol in columns if kol in df.columns]]
+
+
+# --- LANGKAH 1: Index Master Excel ---
+def prepare_master(df_master):
+    """Normalisasi data Master Excel menjadi index unik per idsubsls."""
+    id_asli = df_master['idsubsls']
+    ids = clean_text(id_asli)
+    kdsubsls_original = clean_text(df_master['kdsubsls'])
+    nmsls = clean_text(df_master['nmsls'])
+
+    # Duplikasi hanya dihitung dari idsubsls yang terisi
+    duplikat = _hitung_duplikat(ids[id_asli.notna()])
+    digit_count, digit_samples = _issue_digit(ids, kdsubsls_original, 'Excel')
+
+    frame = pd.DataFrame({
+        'idsubsls': ids,
+        'nmsls': nmsls,
+        'kdsubsls': _normalisasi_kdsubsls(kdsubsls_original),
+        'kdsubsls_original': kdsubsls_original,
+    })
+    # Nilai diambil dari baris terakhir, urutan mengikuti kemunculan pertama (seperti dict)
+    terakhir = frame[~ids.duplicated(keep='last')].set_index('idsubsls')
+    urutan = ids[~ids.duplicated(keep='first')]
+    data = terakhir.reindex(pd.Index(urutan, name='idsubsls'))
+    data['is_duplicate'] = data.index.isin(duplikat.index)
+    # Kunci normalisasi dihitung sekali per Master (ikut tersimpan di cache index)
+    data['nmsls_kunci'] = normalize_nmsls(data['nmsls'])
+
+    return {
+        'data': data,
+        'duplicates': duplikat,
+        'digit_issue_count': digit_count,
+        'digit_issue_samples': digit_samples,
+    }
+
+
+# --- LANGKAH 2: Normalisasi atribut GeoPackage ---
+def _idsubsls_terisi(id_asli):
+    """Mask baris yang idsubsls-nya terisi (bukan NaN/None/''/0)."""
+    valid = id_asli.notna()
+    if pd.api.types.is_numeric_dtype(id_asli) or pd.api.types.is_bool_dtype(id_asli):
+        return valid & (id_asli != 0)
+    return valid & (id_asli.astype(object) != '')
+
+
+def prepare_gpkg(df_gpkg):
+    """Normalisasi atribut GeoPackage; baris tanpa idsubsls diabaikan."""
+    def kolom(nama):
+        if nama in df_gpkg.columns:
+            return df_gpkg[nama]
+        return pd.Series(None, index=df_gpkg.index, dtype=object)
+
+    id_asli = kolom('idsubsls')
+    valid = _idsubsls_terisi(id_asli)
+    ids = clean_text(id_asli[valid])
+
+    nmsls_asli = kolom('nmsls')[valid]
+    nmsls = clean_text(nmsls_asli)
+    # Setara str(x or ''): None dan string kosong menjadi ''
+    nmsls = nmsls.mask(nmsls_asli.to_numpy(dtype=object) == None, '')  # noqa: E711
+
+    kd_asli = kolom('kdsubsls')[valid]
+    kd_kosong = kd_asli.isna() | (kd_asli.astype(object) == '')
+    kdsubsls_original = clean_text(kd_asli, '')
+    kdsubsls = _normalisasi_kdsubsls(kdsubsls_original)
+    kdsubsls = kdsubsls.mask(kd_kosong, '00')
+
+    digit_count, digit_samples = _issue_digit(ids, kdsubsls_original, 'GPKG')
+
+    rows = pd.DataFrame({
+        'idsubsls': ids,
+        'nmsls': nmsls,
+        'kdsubsls': kdsubsls,
+        'kdsubsls_original': kdsubsls_original,
+    }).reset_index(drop=True)
+
+    return {
+        'rows': rows,
+        'total_rows': len(df_gpkg),
+        'duplicates': _hitung_duplikat(rows['idsubsls']),
+        'digit_issue_count': digit_count,
+        'digit_issue_samples': digit_samples,
+    }
+
+
+# --- LANGKAH 3, 4 & 5: Bandingkan GPKG dengan Master ---
+def _label_duplikasi(dup_master, dup_gpkg):
+    kode = np.select([dup_master & dup_gpkg, dup_master, dup_gpkg], [3, 2, 1], 0)
+    return pd.Categorical.from_codes(kode, KATEGORI_DUPLIKASI)
+
+
+def compare(master, gpkg, include_missing=True):
+    """Bandingkan seluruh baris GPKG dengan Master dalam satu outer merge.
+
+    Urutan hasil: baris GPKG sesuai urutan file, disusul baris Master yang
+    tidak ditemukan di GeoPackage sesuai urutan Excel. Dengan
+    include_missing=False hanya baris GPKG yang dikembalikan (left merge).
+    """
+    kiri = gpkg['rows'].copy()
+    kiri['_urutan'] = np.arange(len(kiri))
+    kiri['_dup_gpkg'] = kiri['idsubsls'].isin(gpkg['duplicates'].index)
+
+    kanan = master['data'].reset_index()
+    kanan['_urutan_master'] = np.arange(len(kanan))
+
+    gabung = kiri.merge(kanan, on='idsubsls', how='outer' if include_missing else 'left', indicator=True,
+                        suffixes=('_gpkg', '_master'), sort=False)
+
+    urutan = np.where(gabung['_merge'] == 'right_only',
+                      len(kiri) + gabung['_urutan_master'], gabung['_urutan'])
+    gabung = gabung.iloc[np.argsort(urutan, kind='stable')].reset_index(drop=True)
+
+    ketemu = (gabung['_merge'] == 'both').to_numpy()
+    hanya_gpkg = (gabung['_merge'] == 'left_only').to_numpy()
+    hanya_master = (gabung['_merge'] == 'right_only').to_numpy()
+
+    duplikasi = _label_duplikasi(gabung['is_duplicate'].fillna(False).astype(bool).to_numpy(),
+                                 gabung['_dup_gpkg'].fillna(False).astype(bool).to_numpy())
+
+    teks = {kol: gabung[kol].astype(object).fillna('') for kol in (
+        'nmsls_gpkg', 'nmsls_master', 'kdsubsls_gpkg', 'kdsubsls_original_gpkg',
+        'kdsubsls_master', 'kdsubsls_original_master')}
+    beda_nmsls = (teks['nmsls_gpkg'] != teks['nmsls_master']).to_numpy()
+    beda_kdsubsls = (teks['kdsubsls_gpkg'] != teks['kdsubsls_master']).to_numpy()
+
+    # Hanya pasangan yang NMSLS-nya berbeda yang dinilai kosmetik/substantif
+    jenis_nmsls = np.zeros(len(gabung), dtype=np.int8)
+    dinilai = np.flatnonzero(ketemu & beda_nmsls)
+    if len(dinilai):
+        kunci_master = (gabung['nmsls_kunci'].iloc[dinilai] if 'nmsls_kunci' in gabung.columns
+                        else normalize_nmsls(teks['nmsls_master'].iloc[dinilai]))
+        jenis_nmsls[dinilai] = classify_nmsls(normalize_nmsls(teks['nmsls_gpkg'].iloc[dinilai]), kunci_master)
+    # Kode mengikuti urutan KATEGORI_STATUS
+    status = pd.Categorical.from_codes(np.select(
+        [hanya_gpkg, hanya_master, ketemu & beda_nmsls & beda_kdsubsls, ketemu & beda_nmsls, ketemu & beda_kdsubsls],
+        [4, 5, 3, 1, 2],
+        0
+    ), KATEGORI_STATUS)
+
+    return pd.DataFrame({
+        'IDSUB_SLS': gabung['idsubsls'].astype(object),
+        'NMSLS_GPKG': teks['nmsls_gpkg'],
+        'NMSLS_MASTER': teks['nmsls_master'],
+        'KDSUBSLS_GPKG': teks['kdsubsls_gpkg'],
+        'KDSUBSLS_GPKG_ORIGINAL': teks['kdsubsls_original_gpkg'],
+        'KDSUBSLS_MASTER': teks['kdsubsls_master'],
+        'KDSUBSLS_MASTER_ORIGINAL': teks['kdsubsls_original_master'],
+        'Duplikasi_idsubsls': duplikasi,
+        'Status': status,
+        'Jenis_Beda_NMSLS': pd.Categorical.from_codes(jenis_nmsls, KATEGORI_BEDA_NMSLS),
+    }, columns=KOLOM_HASIL)
+
+
+# --- Laporan digit & duplikasi ---
+def report_row(**isi):
+    """Satu baris laporan dengan kolom KOLOM_HASIL; kolom yang tidak diisi dikosongkan."""
+    baris = dict.fromkeys(KOLOM_HASIL, '')
+    baris.update(isi)
+    return baris
+
+
+def build_report_rows(master, gpkg, hasil=None):
+    """Susun baris laporan issue digit kdsubsls dan duplikasi idsubsls.
+
+    Jika ``hasil`` diberikan, ditambahkan kandidat Master terdekat untuk
+    setiap baris 'Tidak Ditemukan di Master' (lihat build_candidate_rows).
+    """
+    rows = [report_row(
+        IDSUB_SLS='=== ISSUE DIGIT KDSUBSLS ===',
+        KDSUBSLS_GPKG=f"Total issue GPKG: {gpkg['digit_issue_count']}",
+        KDSUBSLS_MASTER=f"Total issue Excel: {master['digit_issue_count']}",
+        Status='Laporan Digit'
+    )]
+    for issue in gpkg['digit_issue_samples']:
+        rows.append(report_row(IDSUB_SLS=issue.split(':')[1].strip(), KDSUBSLS_GPKG=issue, Status='Issue Digit GPKG'))
+    for issue in master['digit_issue_samples']:
+        rows.append(report_row(IDSUB_SLS=issue.split(':')[1].strip(), KDSUBSLS_MASTER=issue, Status='Issue Digit Excel'))
+
+    rows.append(report_row(
+        IDSUB_SLS='=== LAPORAN DUPLIKASI IDSUB_SLS ===',
+        KDSUBSLS_GPKG=f"Total duplikat GPKG: {len(gpkg['duplicates'])}",
+        KDSUBSLS_MASTER=f"Total duplikat Excel: {len(master['duplicates'])}",
+        Status='Laporan Duplikasi'
+    ))
+    # Loop lama menambah hitungan duplikat GPKG sekali lagi per kemunculan,
+    # sehingga angka yang dilaporkan dua kali lipat; dipertahankan agar laporan identik.
+    for duplicate_id, count in gpkg['duplicates'].head(BATAS_DETAIL).items():
+        rows.append(report_row(
+            IDSUB_SLS=duplicate_id, NMSLS_GPKG=f"Duplikat {count * 2} kali di GPKG",
+            Duplikasi_idsubsls='Duplikat (GPKG)', Status='Detail Duplikasi'
+        ))
+    for duplicate_id, count in master['duplicates'].head(BATAS_DETAIL).items():
+        rows.append(report_row(
+            IDSUB_SLS=duplicate_id, NMSLS_MASTER=f"Duplikat {count} kali di Excel",
+            Duplikasi_idsubsls='Duplikat (Excel)', Status='Detail Duplikasi'
+        ))
+    if hasil is not None:
+        rows.extend(build_candidate_rows(master, hasil))
+    return rows
+
+
+# --- Kandidat Master untuk idsubsls yang tidak ditemukan ---
+# Tingkat wilayah tempat idsubsls (16 digit) mulai berbeda, menurut panjang awalan yang sama
+TINGKAT_BEDA = ('prov', 'kab', 'kec', 'desa', 'sls', 'subsls')
+BATAS_TINGKAT = (2, 4, 7, 10, 14)
+
+
+class PrefixIndex:
+    """Index awalan idsubsls Master: array terurut per kdsubsls.
+
+    ID dengan awalan bersama terpanjang selalu bersebelahan dengan posisi
+    sisip ID yang dicari di array terurut, sehingga k kandidat terbaik
+    cukup dicari di antara k tetangga kiri dan kanan (searchsorted,
+    O(log n) per ID, seluruhnya vektor).
+    """
+
+    def __init__(self, data):
+        ids = data.index.to_numpy(dtype=str)
+        kdsubsls = data['kdsubsls'].to_numpy(dtype=str)
+        urutan = np.lexsort((ids, kdsubsls))
+        self.ids = ids[urutan]
+        self.kdsubsls = kdsubsls[urutan]
+        self.nmsls = data['nmsls'].to_numpy(dtype=object)[urutan]
+        # Rentang [awal, akhir) setiap grup kdsubsls di array terurut
+        self.grup, self.awal = np.unique(self.kdsubsls, return_index=True)
+        self.akhir = np.append(self.awal[1:], len(self.ids))
+
+    def nearest(self, ids, kdsubsls, k=JUMLAH_KANDIDAT):
+        """Kandidat Master dengan kdsubsls sama dan awalan idsubsls bersama terpanjang.
+
+        Kembalikan DataFrame satu baris per (ID, kandidat): posisi ID pada
+        input, peringkat, idsubsls dan nmsls kandidat, panjang awalan yang
+        sama, dan tingkat wilayah tempat ID mulai berbeda.
+        """
+        ids = np.asarray(ids, dtype=str)
+        kdsubsls = np.asarray(kdsubsls, dtype=str)
+        kosong = pd.DataFrame(columns=['posisi', 'peringkat', 'kandidat', 'nmsls', 'prefix_sama', 'beda_di'])
+        if not len(ids) or not len(self.ids):
+            return kosong
+
+        # Rentang grup kdsubsls milik tiap ID (kosong jika kdsubsls tidak ada di Master)
+        g = np.searchsorted(self.grup, kdsubsls).clip(max=len(self.grup) - 1)
+        ada = self.grup[g] == kdsubsls
+        awal = np.where(ada, self.awal[g], 0)
+        akhir = np.where(ada, self.akhir[g], 0)
+        sisip = np.zeros(len(ids), dtype=np.int64)
+        # Posisi sisip dicari per grup agar pembandingnya hanya ID dengan kdsubsls sama
+        for kode in np.unique(g[ada]):
+            pilih = ada & (g == kode)
+            sisip[pilih] = self.awal[kode] + np.searchsorted(self.ids[self.awal[kode]:self.akhir[kode]], ids[pilih])
+
+        # Jendela k tetangga kiri dan kanan, dibatasi rentang grupnya
+        geser = np.arange(-k, k)
+        jendela = sisip[:, None] + geser[None, :]
+        valid = ada[:, None] & (jendela >= awal[:, None]) & (jendela < akhir[:, None])
+        jendela = np.where(valid, jendela, 0)
+
+        lebar = max(np.char.str_len(ids).max(), np.char.str_len(self.ids).max())
+        kode_id = ids.astype(f'U{lebar}').view(np.uint32).reshape(len(ids), 1, lebar)
+        kode_kandidat = self.ids[jendela].astype(f'U{lebar}').view(np.uint32).reshape(*jendela.shape, lebar)
+        sama = (kode_kandidat == kode_id) & (kode_id != 0)
+        prefix = np.cumprod(sama, axis=2).sum(axis=2)
+        prefix = np.where(valid, prefix, -1)
+
+        # Urutkan per ID: awalan terpanjang dulu, lalu yang paling dekat di urutan
+        jarak = np.abs(geser + 0.5)[None, :].repeat(len(ids), axis=0)
+        urutan = np.lexsort((jarak, -prefix), axis=1)[:, :k]
+        baris = np.arange(len(ids))[:, None]
+        prefix = prefix[baris, urutan]
+        jendela = jendela[baris, urutan]
+
+        posisi, peringkat = np.nonzero(prefix >= 0)
+        terpilih = jendela[posisi, peringkat]
+        panjang = prefix[posisi, peringkat]
+        tingkat = np.array(TINGKAT_BEDA + ('-',), dtype=object)[np.searchsorted(BATAS_TINGKAT, panjang, side='right')]
+        return pd.DataFrame({
+            'posisi': posisi,
+            'peringkat': peringkat + 1,
+            'kandidat': self.ids[terpilih].astype(object),
+            'nmsls': self.nmsls[terpilih],
+            'prefix_sama': panjang,
+            'beda_di': tingkat,
+        })
+
+
+def nearest_candidates(master, hasil, k=JUMLAH_KANDIDAT, index=None):
+    """Kandidat Master terdekat untuk setiap baris 'Tidak Ditemukan di Master' pada hasil.
+
+    Kolom ``posisi`` menunjuk baris ke-berapa di antara baris yang tidak
+    ditemukan. ``index`` (PrefixIndex Master) dapat diberikan agar tidak
+    dibangun ulang untuk setiap batch.
+    """
+    if index is None:
+        index = PrefixIndex(master['data'])
+    tidak_ketemu = hasil[hasil['Status'] == 'Tidak Ditemukan di Master']
+    kandidat = index.nearest(tidak_ketemu['IDSUB_SLS'], tidak_ketemu['KDSUBSLS_GPKG'], k)
+    kandidat.insert(1, 'IDSUB_SLS', tidak_ketemu['IDSUB_SLS'].to_numpy(dtype=object)[kandidat['posisi']])
+    kandidat.insert(2, 'KDSUBSLS_GPKG', tidak_ketemu['KDSUBSLS_GPKG'].to_numpy(dtype=object)[kandidat['posisi']])
+    return kandidat
+
+
+def _baris_kandidat(master, hasil, k=JUMLAH_KANDIDAT, index=None):
+    """Baris 'Kandidat Master' untuk hasil, dan jumlah kandidat terdekat per tingkat beda."""
+    tidak_ketemu = hasil.loc[hasil['Status'] == 'Tidak Ditemukan di Master', ['IDSUB_SLS', 'NMSLS_GPKG', 'KDSUBSLS_GPKG']]
+    if not len(tidak_ketemu):
+        return [], pd.Series(dtype='int64')
+    with sls_profil.phase("Kandidat Master"):
+        kandidat = nearest_candidates(master, hasil, k, index)
+    per_tingkat = kandidat.loc[kandidat['peringkat'] == 1, 'beda_di'].value_counts()
+    # Kandidat dipisah '; ' dengan yang terdekat dulu
+    if len(kandidat):
+        teks = (kandidat['kandidat'].astype(str) + " (" + kandidat['nmsls'].astype(str) + ", beda di "
+                + kandidat['beda_di'].astype(str) + ", " + kandidat['prefix_sama'].astype(str) + " digit awal sama)")
+        daftar = teks.groupby(kandidat['posisi'].to_numpy(), sort=True).agg('; '.join)
+    else:
+        # Tidak ada baris dengan kdsubsls yang juga ada di Master (atau Master kosong)
+        daftar = pd.Series(dtype=object)
+    daftar = daftar.reindex(range(len(tidak_ketemu)), fill_value="Tidak ada Master dengan kdsubsls yang sama")
+    rows = [report_row(IDSUB_SLS=idsubsls, NMSLS_GPKG=nmsls, KDSUBSLS_GPKG=kdsubsls,
+                       KDSUBSLS_MASTER=isi, Status='Kandidat Master')
+            for (idsubsls, nmsls, kdsubsls), isi in zip(tidak_ketemu.itertuples(index=False, name=None), daftar)]
+    return rows, per_tingkat
+
+
+def _kepala_kandidat(total, per_tingkat):
+    """Baris judul bagian kandidat Master."""
+    return report_row(
+        IDSUB_SLS='=== KANDIDAT MASTER (TIDAK DITEMUKAN DI MASTER) ===',
+        KDSUBSLS_GPKG=f"Total tidak ditemukan: {total}",
+        KDSUBSLS_MASTER="Mulai beda di " + ", ".join(f"{t}: {int(per_tingkat.get(t, 0))}" for t in TINGKAT_BEDA),
+        Status='Laporan Kandidat'
+    )
+
+
+def build_candidate_rows(master, hasil, k=JUMLAH_KANDIDAT):
+    """Baris laporan kandidat Master: satu baris per baris 'Tidak Ditemukan di Master'."""
+    rows, per_tingkat = _baris_kandidat(master, hasil, k)
+    if not rows:
+        return []
+    return [_kepala_kandidat(len(rows), per_tingkat)] + rows
+
+
+# --- Ringkasan hasil ---
+def summarize(hasil, ringkasan=None):
+    """Hitung statistik hasil; jika ringkasan diberikan, statistik blok ini ditambahkan ke sana."""
+    if ringkasan is None:
+        ringkasan = {
+            'total': 0, 'sesuai': 0, 'tidak_ditemukan_master': 0, 'tidak_ditemukan_gpkg': 0,
+            'beda_nmsls': 0, 'beda_nmsls_kosmetik': 0, 'beda_nmsls_substantif': 0, 'beda_kdsubsls': 0,
+            'duplikat_gpkg': 0, 'duplikat_excel': 0, 'duplikat_keduanya': 0,
+            'ketidakcocokan': 0, 'contoh_ketidakcocokan': [],
+        }
+
+    # Cukup hitung per nilai unik; jumlah kategori status/duplikasi sangat kecil
+    per_status = hasil['Status'].value_counts()
+    per_duplikasi = hasil['Duplikasi_idsubsls'].value_counts()
+    per_jenis_nmsls = hasil['Jenis_Beda_NMSLS'].value_counts()
+
+    ringkasan['total'] += len(hasil)
+    ringkasan['sesuai'] += int(per_status.get('Sesuai', 0))
+    ringkasan['tidak_ditemukan_master'] += int(per_status.get('Tidak Ditemukan di Master', 0))
+    ringkasan['tidak_ditemukan_gpkg'] += int(per_status.get('Tidak Ditemukan di GeoPackage', 0))
+    ringkasan['beda_nmsls'] += int(sum(n for st, n in per_status.items() if 'Beda NMSLS' in st))
+    ringkasan['beda_nmsls_kosmetik'] += int(per_jenis_nmsls.get('Kosmetik', 0))
+    ringkasan['beda_nmsls_substantif'] += int(per_jenis_nmsls.get('Substantif', 0))
+    ringkasan['beda_kdsubsls'] += int(sum(n for st, n in per_status.items() if 'Beda KdSubSLS' in st))
+    ringkasan['duplikat_gpkg'] += int(per_duplikasi.get('Duplikat (GPKG)', 0))
+    ringkasan['duplikat_excel'] += int(per_duplikasi.get('Duplikat (Excel)', 0))
+    ringkasan['duplikat_keduanya'] += int(per_duplikasi.get('Duplikat (Excel & GPKG)', 0))
+    ringkasan['ketidakcocokan'] += len(hasil) - int(per_status.get('Sesuai', 0))
+
+    kurang = BATAS_DETAIL - len(ringkasan['contoh_ketidakcocokan'])
+    if kurang > 0:
+        contoh = hasil.loc[hasil['Status'] != 'Sesuai', ['IDSUB_SLS', 'Status']].head(kurang)
+        ringkasan['contoh_ketidakcocokan'].extend(contoh.itertuples(index=False, name=None))
+    return ringkasan
+
+
+# --- Mode streaming untuk GeoPackage yang sangat besar ---
+def _master_untuk(master, ids):
+    """Potong index Master hanya untuk idsubsls yang ada di batch."""
+    posisi = master['data'].index.get_indexer(ids.unique())
+    return {'data': master['data'].iloc[np.sort(posisi[posisi >= 0])]}
+
+
+def _gabung_hitungan(hitungan, baru):
+    """Jumlahkan dua Series id -> jumlah; urutan mengikuti kemunculan pertama."""
+    if hitungan is None or hitungan.empty:
+        return baru
+    return pd.concat([hitungan, baru]).groupby(level=0, sort=False).sum()
+
+
+def _hitung_id(ids, hitungan=None):
+    """Akumulasi jumlah kemunculan idsubsls ke hitungan sebelumnya."""
+    return _gabung_hitungan(hitungan, ids.value_counts(sort=False))
+
+
+def _hasil_hilang_di_gpkg(master, ids_gpkg):
+    """Baris 'Tidak Ditemukan di GeoPackage' untuk Master yang idsubsls-nya tidak ada di ids_gpkg."""
+    data_master = master['data']
+    tanpa_gpkg = {'rows': pd.DataFrame(columns=['idsubsls', 'nmsls', 'kdsubsls', 'kdsubsls_original'], dtype=object),
+                  'duplicates': pd.Series(dtype='int64')}
+    return compare({'data': data_master[~data_master.index.isin(ids_gpkg)]}, tanpa_gpkg)
+
+
+def run_streaming(gpkg_path, master, output_path, batch_size=UKURAN_BATCH, progress=None, meter=None, cancel=None):
+    """Bandingkan GeoPackage per batch dan tulis hasilnya langsung ke CSV.
+
+    Pass pertama hanya membaca idsubsls untuk menghitung duplikasi dan
+    mencatat ID yang ada; pass kedua membandingkan tiap batch dengan index
+    Master. Memori puncak sebanding ukuran batch (ditambah daftar ID unik),
+    bukan ukuran data. Mengembalikan ringkasan seperti summarize().
+
+    Jika dibatalkan lewat ``cancel``, file keluaran yang belum lengkap dihapus.
+    """
+    try:
+        return _run_streaming(gpkg_path, master, output_path, batch_size,
+                              progress or silent, meter or silent, cancel)
+    except CheckCancelled:
+        Path(output_path).unlink(missing_ok=True)
+        raise
+
+
+def _run_streaming(gpkg_path, master, output_path, batch_size, lapor, meter, cancel):
+    total_rows = count_gpkg_rows(gpkg_path)
+
+    # Pass 1: hitung idsubsls saja
+    lapor("Pass 1: menghitung idsubsls di GeoPackage...")
+    hitungan = None
+    dibaca = 0
+    meter("Pass 1: menghitung idsubsls", 0, total_rows)
+    with sls_profil.phase("Streaming pass 1 (idsubsls)"):
+        for batch in iter_gpkg_batches(gpkg_path, batch_size, columns=('idsubsls',)):
+            check_cancel(cancel)
+            dibaca += len(batch)
+            meter("Pass 1: menghitung idsubsls", dibaca, total_rows)
+            id_asli = batch['idsubsls'] if 'idsubsls' in batch.columns else pd.Series(None, index=batch.index, dtype=object)
+            hitungan = _hitung_id(clean_text(id_asli[_idsubsls_terisi(id_asli)]), hitungan)
+    if hitungan is None:
+        hitungan = pd.Series(dtype='int64')
+    duplikat = hitungan[hitungan > 1]
+    if len(duplikat):
+        lapor(f"Peringatan: Ditemukan {len(duplikat)} IDSUBSLS duplikat di GeoPackage")
+
+    # Pass 2: bandingkan per batch dan tulis langsung ke file
+    ringkasan = None
+    digit_count, digit_samples = 0, []
+    # Baris kandidat Master dihitung per batch dan ditampung di file sementara,
+    # bukan di memori: jika Master yang dipilih salah, hampir semua baris tidak ditemukan
+    indeks_kandidat = None
+    jumlah_kandidat, kandidat_per_tingkat = 0, pd.Series(dtype='int64')
+    diproses = 0
+    meter("Pass 2: membandingkan", 0, total_rows)
+    with open(output_path, 'w', newline='', encoding='utf-8') as f, \
+            tempfile.TemporaryFile('w+', newline='', encoding='utf-8') as tampung_kandidat:
+        header = True
+        with sls_profil.phase("Streaming pass 2 (bandingkan + tulis)"):
+            for batch in iter_gpkg_batches(gpkg_path, batch_size):
+                check_cancel(cancel)
+                gpkg = prepare_gpkg(batch)
+                gpkg['duplicates'] = duplikat
+                hasil = compare(_master_untuk(master, gpkg['rows']['idsubsls']), gpkg, include_missing=False)
+                hasil.to_csv(f, header=header, index=False)
+                header = False
+
+                ringkasan = summarize(hasil, ringkasan)
+                if (hasil['Status'] == 'Tidak Ditemukan di Master').any():
+                    if indeks_kandidat is None:
+                        indeks_kandidat = PrefixIndex(master['data'])
+                    baris, per_tingkat = _baris_kandidat(master, hasil, index=indeks_kandidat)
+                    pd.DataFrame(baris, columns=KOLOM_HASIL).to_csv(tampung_kandidat, header=False, index=False)
+                    jumlah_kandidat += len(baris)
+                    kandidat_per_tingkat = kandidat_per_tingkat.add(per_tingkat, fill_value=0)
+                digit_count += gpkg['digit_issue_count']
+                digit_samples = (digit_samples + gpkg['digit_issue_samples'])[:BATAS_DETAIL]
+                diproses += len(batch)
+                lapor(f"Memproses data: {int(diproses / max(total_rows, 1) * 100)}% ({diproses}/{total_rows})")
+                meter("Pass 2: membandingkan", diproses, total_rows)
+
+        # --- LANGKAH 5: Data Master yang tidak ada di GeoPackage ---
+        lapor("Mengecek data yang hilang di GeoPackage...")
+        with sls_profil.phase("Data hilang di GeoPackage"):
+            hasil = _hasil_hilang_di_gpkg(master, hitungan.index)
+            hasil.to_csv(f, header=header, index=False)
+            ringkasan = summarize(hasil, ringkasan)
+
+        ringkasan_gpkg = {'duplicates': duplikat, 'digit_issue_count': digit_count,
+                          'digit_issue_samples': digit_samples}
+        with sls_profil.phase("Laporan digit/duplikasi"):
+            laporan = build_report_rows(master, ringkasan_gpkg)
+            if jumlah_kandidat:
+                laporan.append(_kepala_kandidat(jumlah_kandidat, kandidat_per_tingkat))
+            pd.DataFrame(laporan, columns=KOLOM_HASIL).to_csv(f, header=False, index=False)
+            tampung_kandidat.seek(0)
+            shutil.copyfileobj(tampung_kandidat, f)
+
+    return ringkasan
+
+
+# --- Pipeline pengecekan (dipakai GUI dan CLI) ---
+def validate_files(gpkg_path, excel_path):
+    """Validasi keberadaan dan format file"""
+    if not os.path.exists(gpkg_path):
+        return False, "File GeoPackage tidak ditemukan"
+    if not os.path.exists(excel_path):
+        return False, "File Excel tidak ditemukan"
+    if not gpkg_path.lower().endswith('.gpkg'):
+        return False, "File GeoPackage harus berekstensi .gpkg"
+    if not excel_path.lower().endswith(('.xlsx', '.xls')):
+        return False, "File Excel harus berekstensi .xlsx atau .xls"
+    return True, "OK"
+
+
+def error_message(exc):
+    """Terjemahkan exception saat pengecekan menjadi pesan untuk pengguna."""
+    if isinstance(exc, CheckCancelled):
+        return str(exc)
+    if isinstance(exc, FileNotFoundError):
+        return f"File tidak ditemukan: {exc}"
+    if isinstance(exc, PermissionError):
+        return f"Tidak ada izin untuk membaca file: {exc}"
+    if isinstance(exc, pd.errors.EmptyDataError):
+        return "File Excel kosong"
+    if isinstance(exc, KeyError):
+        return ("Error: Kolom tidak ditemukan. Pastikan file Anda memiliki kolom "
+                f"'idsubsls', 'nmsls', dan 'kdsubsls'. Detail: {exc}")
+    return f"Terjadi error: {str(exc)}"
+
+
+def read_master_excel(excel_path):
+    return pd.read_excel(excel_path, dtype={'idsubsls': str, 'kdsubsls': str, 'nmsls': str})
+
+
+def load_master(excel_path, progress=None):
+    """Baca Master Excel dan bangun index-nya, sambil melaporkan peringatan."""
+    lapor = progress or silent
+    lapor("Membaca file Master Excel...")
+    with sls_profil.phase("Baca Master Excel"):
+        df_master = read_master_excel(excel_path)
+    with sls_profil.phase("Index Master"):
+        master = prepare_master(df_master)
+    report_master(master, lapor)
+    return master
+
+
+def report_master(master, progress=None):
+    """Laporkan jumlah baris dan peringatan index Master ke callback progress."""
+    lapor = progress or silent
+    lapor(f"Berhasil memuat {len(master['data'])} baris dari Master Excel.")
+    if master['digit_issue_count']:
+        lapor(f"Peringatan: Ditemukan {master['digit_issue_count']} issue digit kdsubsls di Excel")
+    if len(master['duplicates']):
+        lapor(f"Peringatan: Ditemukan {len(master['duplicates'])} IDSUBSLS duplikat di Excel")
+
+
+def load_gpkg(gpkg_path, progress=None, meter=None, cancel=None):
+    """Baca atribut GeoPackage sambil melaporkan progress (padanan load_master)."""
+    lapor = progress or silent
+    lapor("Membaca file GeoPackage...")
+    with sls_profil.phase("Baca GeoPackage"):
+        df_gpkg = read_gpkg_attributes(gpkg_path, meter=meter, cancel=cancel)
+    lapor(f"Berhasil memuat {len(df_gpkg)} baris dari GeoPackage.")
+    return df_gpkg
+
+
+def load_sources(gpkg_path, master_loader, progress=None, meter=None, cancel=None, gpkg_loader=None):
+    """Muat index Master dan atribut GeoPackage bersamaan di dua thread.
+
+    ``master_loader`` adalah fungsi tanpa argumen yang mengembalikan index
+    Master (misalnya load_master atau MasterCache.load); ``gpkg_loader``
+    (opsional) menggantikan pembacaan atribut GeoPackage. Waktu total menjadi
+    kira-kira waktu sumber yang paling lambat; waktu per sumber dilaporkan
+    ke log. ``cancel`` juga dicek selama menunggu, sehingga pembatalan tidak
+    menunggu Excel selesai diurai. Mengembalikan (master, df_gpkg).
+    """
+    lapor = progress or silent
+    meter = meter or silent
+    waktu = {}
+
+    def _timed(nama, fungsi):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        waktu[nama] = time.perf_counter() - mulai
+        return hasil
+
+    mulai = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=2)
+    try:
+        tugas_master = pool.submit(_timed, 'Master Excel', master_loader)
+        tugas_gpkg = pool.submit(_timed, 'GeoPackage',
+                                 gpkg_loader or (lambda: load_gpkg(gpkg_path, lapor, meter, cancel)))
+        df_gpkg = _tunggu(tugas_gpkg, cancel)
+        menunggu = not tugas_master.done()
+        if menunggu:
+            meter("Menunggu Master Excel", 0, 1)
+        master = _tunggu(tugas_master, cancel)
+        if menunggu:
+            meter("Menunggu Master Excel", 1, 1)
+    finally:
+        # Tanpa menunggu thread: saat dibatalkan atau gagal, pembacaan Excel yang
+        # masih berjalan ditinggalkan dan hasilnya dibuang
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    lapor(f"Waktu muat: Master Excel {waktu['Master Excel']:.2f} detik, GeoPackage {waktu['GeoPackage']:.2f} "
+          f"detik (bersamaan, total {time.perf_counter() - mulai:.2f} detik)")
+    return master, df_gpkg
+
+
+def run_check(gpkg_path, excel_path=None, progress=None, master=None, meter=None, cancel=None, master_loader=None,
+              gpkg_loader=None):
+    """Jalankan pengecekan satu GeoPackage terhadap Master Excel.
+
+    Index Master yang sudah dibangun bisa diberikan lewat ``master`` agar
+    Excel tidak dibaca ulang. Jika tidak, Master (dari ``excel_path`` atau
+    ``master_loader``) dimuat bersamaan dengan GeoPackage (atau hasil
+    ``gpkg_loader``, misalnya dari SessionCache). ``meter``
+    menerima progress numerik (fase, selesai, total) dan ``cancel``
+    (threading.Event) dicek di antara batch. Mengembalikan (hasil, laporan):
+    DataFrame baris data dan daftar baris laporan digit/duplikasi.
+    """
+    lapor = progress or silent
+    if master is None:
+        loader = master_loader or (lambda: load_master(excel_path, lapor))
+        master, df_gpkg = load_sources(gpkg_path, loader, lapor, meter, cancel, gpkg_loader)
+    else:
+        df_gpkg = gpkg_loader() if gpkg_loader else load_gpkg(gpkg_path, lapor, meter, cancel)
+    check_cancel(cancel)
+    with sls_profil.phase("Index GeoPackage"):
+        gpkg = prepare_gpkg(df_gpkg)
+    check_cancel(cancel)
+
+    lapor("Memulai perbandingan data...")
+    meter = meter or silent
+    meter("Membandingkan data", 0, 1)
+    with sls_profil.phase("Perbandingan"):
+        hasil = compare(master, gpkg)
+    meter("Membandingkan data", 1, 1)
+    with sls_profil.phase("Laporan digit/duplikasi"):
+        laporan = build_report_rows(master, gpkg, hasil)
+    return hasil, laporan
+
+
+# --- Ekspor hasil (CSV / Parquet / XLSX) ---
+def pad_kdsubsls(kolom):
+    """Versi vektor dari f"{x:0>2}" untuk kdsubsls yang hanya satu digit angka."""
+    teks = kolom.astype(object).astype(str)
+    return teks.mask(teks.str.isdigit() & (teks.str.len() == 1), '0' + teks)
+
+
+def _blok_ekspor(frame, posisi=None, ukuran=BARIS_PER_BLOK):
+    """Potong hasil per blok dan rapikan kdsubsls, agar ekspor tidak menyalin seluruh data sekaligus.
+
+    Jika ``posisi`` diberikan, hanya baris pada posisi itu yang diambil, per blok.
+    """
+    for mulai in range(0, len(frame) if posisi is None else len(posisi), ukuran):
+        blok = frame.iloc[mulai:mulai + ukuran] if posisi is None else frame.iloc[posisi[mulai:mulai + ukuran]]
+        yield blok.assign(KDSUBSLS_GPKG=pad_kdsubsls(blok['KDSUBSLS_GPKG']),
+                          KDSUBSLS_MASTER=pad_kdsubsls(blok['KDSUBSLS_MASTER']))
+
+
+def write_csv(hasil, laporan, output_path):
+    """Tulis baris data lalu baris laporan ke satu file CSV."""
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        header = True
+        for blok in _blok_ekspor(hasil):
+            blok.to_csv(f, header=header, index=False)
+            header = False
+        pd.DataFrame(laporan, columns=KOLOM_HASIL).to_csv(f, header=header, index=False)
+
+
+def write_parquet(hasil, laporan, output_path):
+    """Tulis hasil ke Parquet per row group; semua kolom bertipe string."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Ekspor Parquet membutuhkan paket 'pyarrow'") from None
+
+    schema = pa.schema([(kolom, pa.string()) for kolom in KOLOM_HASIL])
+    with pq.ParquetWriter(output_path, schema) as writer:
+        for blok in _blok_ekspor(hasil):
+            writer.write_table(pa.Table.from_pandas(blok.astype(str), schema=schema, preserve_index=False))
+        if laporan:
+            writer.write_table(pa.Table.from_pylist(list(laporan), schema=schema))
+
+
+def _nama_sheet(status, bagian):
+    # Nama sheet Excel maksimal 31 karakter
+    nama = status[:31] if bagian == 0 else f"{status[:26]} ({bagian + 1})"
+    return nama
+
+
+def write_xlsx(hasil, laporan, output_path):
+    """Tulis hasil ke XLSX secara streaming (openpyxl write-only), satu sheet per kategori status.
+
+    Baris laporan digit/duplikasi masuk ke sheet 'Laporan'. Kategori yang
+    melebihi batas baris Excel dilanjutkan ke sheet berikutnya.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    per_status = hasil.groupby(hasil['Status'].astype(object), sort=False).indices
+    for status, posisi in per_status.items():
+        for bagian, mulai in enumerate(range(0, len(posisi), MAKS_BARIS_SHEET)):
+            ws = wb.create_sheet(_nama_sheet(status, bagian))
+            ws.append(KOLOM_HASIL)
+            for blok in _blok_ekspor(hasil, posisi[mulai:mulai + MAKS_BARIS_SHEET]):
+                for baris in blok.itertuples(index=False, name=None):
+                    ws.append(baris)
+
+    ws = wb.create_sheet('Laporan')
+    ws.append(KOLOM_HASIL)
+    for baris in laporan:
+        ws.append([baris[kolom] for kolom in KOLOM_HASIL])
+    wb.save(output_path)
+
+
+FORMAT_EKSPOR = {'.csv': write_csv, '.parquet': write_parquet, '.xlsx': write_xlsx}
+
+
+def export_results(hasil, output_path, laporan=()):
+    """Ekspor hasil sesuai ekstensi file tujuan (.csv, .parquet, atau .xlsx)."""
+    suffix = Path(output_path).suffix.lower()
+    if suffix not in FORMAT_EKSPOR:
+        raise ValueError(f"Format ekspor tidak dikenal: {suffix or '(tanpa ekstensi)'}")
+    with sls_profil.phase(f"Ekspor {suffix[1:].upper()}"):
+        FORMAT_EKSPOR[suffix](hasil, laporan, output_path)
+
+
+class CheckResult:
+    """Hasil satu pengecekan dalam bentuk kolumnar.
+
+    ``data`` adalah DataFrame satu baris per fitur/Master dengan kolom Status
+    dan Duplikasi_idsubsls bertipe categorical; ``report`` berisi baris
+    laporan digit/duplikasi, dipisah dari data agar tidak ikut dihitung.
+    ``summary`` adalah hasil summarize(), dihitung sekali saat objek dibuat
+    (di thread worker) sehingga GUI tinggal menampilkannya.
+    """
+    __slots__ = ('data', 'report', 'summary')
+
+    def __init__(self, data, report=(), summary=None):
+        self.data = data
+        self.report = list(report)
+        if summary is None:
+            with sls_profil.phase("Ringkasan"):
+                summary = summarize(data)
+        self.summary = summary
+
+    def __len__(self):
+        return len(self.data)
+
+    def export(self, output_path):
+        export_results(self.data, output_path, self.report)
+
+
+def format_summary(ringkasan, catatan="(Hasil selengkapnya dapat diekspor ke CSV)"):
+    """Susun baris teks ringkasan hasil untuk log GUI atau konsol."""
+    total_duplikat = ringkasan['duplikat_gpkg'] + ringkasan['duplikat_excel'] + ringkasan['duplikat_keduanya']
+    jumlah_mismatch = ringkasan['ketidakcocokan']
+
+    lines = [
+        "\n=== SUMMARY HASIL ===",
+        f"Total Data: {ringkasan['total']}",
+        f"Data Sesuai: {ringkasan['sesuai']}",
+        f"Tidak Ditemukan di Master: {ringkasan['tidak_ditemukan_master']}",
+        f"Tidak Ditemukan di GeoPackage: {ringkasan['tidak_ditemukan_gpkg']}",
+        f"Beda NMSLS: {ringkasan['beda_nmsls']}",
+        f"  - Kosmetik (huruf, spasi, tanda baca, nol di depan, salah ketik kecil): "
+        f"{ringkasan.get('beda_nmsls_kosmetik', 0)}",
+        f"  - Substantif: {ringkasan.get('beda_nmsls_substantif', 0)}",
+        f"Beda KdSubSLS: {ringkasan['beda_kdsubsls']}",
+        f"Duplikat IDSUBSLS: {total_duplikat}",
+        f"  - Duplikat di GPKG: {ringkasan['duplikat_gpkg']}",
+        f"  - Duplikat di Excel: {ringkasan['duplikat_excel']}",
+        f"  - Duplikat di Keduanya: {ringkasan['duplikat_keduanya']}",
+    ]
+
+    if not jumlah_mismatch and total_duplikat == 0:
+        lines.append("\nSELAMAT! Semua data konsisten dan tidak ada duplikasi.")
+        return lines
+
+    lines.append(f"\nDitemukan {jumlah_mismatch + total_duplikat} masalah:")
+    if jumlah_mismatch:
+        lines.append(f"- {jumlah_mismatch} ketidakcocokan data")
+        for i, (idsubsls, status) in enumerate(ringkasan['contoh_ketidakcocokan'], 1):
+            lines.append(f"  {i}. IDSUB_SLS {idsubsls}: {status}")
+    if total_duplikat > 0:
+        lines.append(f"- {total_duplikat} duplikasi IDSUBSLS")
+    if jumlah_mismatch > BATAS_DETAIL or total_duplikat > 0:
+        lines.append(f"\n{catatan}")
+    return lines
+
+
+# --- Pengecekan paralel lintas file / partisi wilayah ---
+# Panjang awalan idsubsls untuk tiap tingkat wilayah
+PANJANG_PREFIX = {'prov': 2, 'kab': 4, 'kec': 7, 'desa': 10}
+
+_master_worker = None
+
+
+def _init_worker(master):
+    """Initializer ProcessPoolExecutor: index Master dikirim sekali per proses."""
+    global _master_worker
+    _master_worker = master
+
+
+def _cek_partisi(nama, sumber):
+    """Bandingkan satu partisi (path GeoPackage atau DataFrame atribut) di proses worker."""
+    mulai = time.perf_counter()
+    df_gpkg = read_gpkg_attributes(sumber) if isinstance(sumber, (str, Path)) else sumber
+    gpkg = prepare_gpkg(df_gpkg)
+    ids = gpkg['rows']['idsubsls']
+    hasil = compare(_master_untuk(_master_worker, ids), gpkg, include_missing=False)
+    return {
+        'nama': nama,
+        'hasil': hasil,
+        'hitungan_id': ids.value_counts(sort=False),
+        'baris': len(df_gpkg),
+        'detik': time.perf_counter() - mulai,
+    }
+
+
+def split_partitions(gpkg_path, level):
+    """Baca atribut satu GeoPackage lalu pecah per awalan idsubsls (prov/kab/kec/desa).
+
+    Mengembalikan daftar (nama_partisi, DataFrame, posisi_baris_asli).
+    """
+    df = read_gpkg_attributes(gpkg_path)
+    if 'idsubsls' not in df.columns:
+        return [(f"{Path(gpkg_path).stem}", df, np.arange(len(df)))]
+    df = df[_idsubsls_terisi(df['idsubsls'])].reset_index(drop=True)
+    prefix = clean_text(df['idsubsls']).str[:PANJANG_PREFIX[level]]
+    return [(f"{Path(gpkg_path).stem}:{kode}", df.iloc[posisi], posisi)
+            for kode, posisi in prefix.groupby(prefix, sort=False).indices.items()]
+
+
+def run_parallel(gpkg_paths, master, max_workers=None, partition_level=None, progress=None):
+    """Cek banyak GeoPackage (atau partisi wilayahnya) paralel dengan ProcessPoolExecutor.
+
+    Semua sumber dibandingkan dengan satu index Master yang dikirim sekali ke
+    setiap proses. Hasil digabung menjadi satu laporan: duplikasi dan data
+    'Tidak Ditemukan di GeoPackage' dihitung ulang secara global setelah
+    penggabungan. Mengembalikan (hasil, laporan, waktu_partisi).
+    """
+    lapor = progress or silent
+    tugas = []
+    for urutan_file, gpkg_path in enumerate(gpkg_paths):
+        if partition_level:
+            for nama, df, posisi in split_partitions(gpkg_path, partition_level):
+                tugas.append((nama, df, (urutan_file, posisi)))
+        else:
+            tugas.append((Path(gpkg_path).stem, str(gpkg_path), (urutan_file, None)))
+    if not tugas:
+        raise ValueError("Tidak ada data GeoPackage untuk dicek")
+    lapor(f"Menjalankan {len(tugas)} partisi secara paralel...")
+
+    keluaran = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(master,)) as pool:
+        futures = {pool.submit(_cek_partisi, nama, sumber): urutan for urutan, (nama, sumber, _) in enumerate(tugas)}
+        for future in as_completed(futures):
+            hasil_partisi = future.result()
+            keluaran[futures[future]] = hasil_partisi
+            lapor(f"Partisi {hasil_partisi['nama']}: {hasil_partisi['baris']} baris "
+                  f"dalam {hasil_partisi['detik']:.2f} detik ({len(keluaran)}/{len(tugas)})")
+
+    # Gabungkan sesuai urutan file lalu urutan baris aslinya
+    bagian, kunci_urut, semua_hitungan = [], [], []
+    for urutan in range(len(tugas)):
+        hasil_partisi = keluaran[urutan]
+        urutan_file, posisi = tugas[urutan][2]
+        bagian.append(hasil_partisi['hasil'])
+        if posisi is None:
+            posisi = np.arange(len(hasil_partisi['hasil']))
+        kunci_urut.append(np.column_stack([np.full(len(posisi), urutan_file), posisi]))
+        semua_hitungan.append(hasil_partisi['hitungan_id'])
+
+    hitungan = pd.concat(semua_hitungan).groupby(level=0, sort=False).sum()
+    kunci = np.concatenate(kunci_urut)
+    hasil = pd.concat(bagian, ignore_index=True)
+    hasil = hasil.iloc[np.lexsort((kunci[:, 1], kunci[:, 0]))].reset_index(drop=True)
+
+    # Duplikasi GPKG bisa melintasi partisi, jadi labelnya dihitung ulang secara global
+    ids = hasil['IDSUB_SLS']
+    dup_gpkg = ids.isin(hitungan.index[hitungan > 1])
+    duplikat = hitungan.reindex(pd.unique(ids[dup_gpkg]))
+    digit_count, digit_samples = _issue_digit(ids, hasil['KDSUBSLS_GPKG_ORIGINAL'], 'GPKG')
+    posisi_master = master['data'].index.get_indexer(ids)
+    dup_master = np.where(posisi_master >= 0,
+                          master['data']['is_duplicate'].to_numpy()[posisi_master], False).astype(bool)
+    hasil['Duplikasi_idsubsls'] = _label_duplikasi(dup_master, dup_gpkg.to_numpy())
+
+    hasil = pd.concat([hasil, _hasil_hilang_di_gpkg(master, hitungan.index)], ignore_index=True)
+    ringkasan_gpkg = {'duplicates': duplikat, 'digit_issue_count': digit_count,
+                      'digit_issue_samples': digit_samples}
+    waktu = [{'partisi': keluaran[i]['nama'], 'baris': keluaran[i]['baris'], 'detik': round(keluaran[i]['detik'], 3)}
+             for i in range(len(tugas))]
+    return hasil, build_report_rows(master, ringkasan_gpkg, hasil), waktu
@@ -0,0 +1,105 @@
+"""Mode pantau folder: cek ulang GeoPackage yang berubah tanpa memulai ulang proses.
+
+Folder dipindai berkala (polling ``os.stat``, tanpa dependensi tambahan dan
+tetap berfungsi di folder jaringan/SMB yang tidak mengirim event). File
+dianggap berubah jika ukuran atau mtime-nya (termasuk file ``-wal``
+SQLite) berbeda dari saat terakhir dicek, dan baru dicek setelah tidak
+berubah selama jeda debounce agar file yang masih disimpan tidak terbaca
+setengah jadi. Index Master disimpan di memori (MasterPool) sehingga
+Excel hanya diurai ulang jika file itu sendiri berubah.
+"""
+import threading
+import time
+from pathlib import Path
+
+import sls_cache
+
+# Jeda antar pemindaian folder (detik)
+JEDA_POLLING = 2.0
+
+# File harus tidak berubah selama ini (detik) sebelum dicek
+JEDA_STABIL = 5.0
+
+
+class FolderWatcher:
+    """Deteksi file di folder yang baru atau berubah, dengan debounce.
+
+    ``poll()`` mengembalikan pasangan (path, signature) untuk file yang
+    sudah stabil dan belum dicek dengan signature itu; pemanggil menandai
+    file sebagai sudah dicek lewat ``mark_checked``.
+    """
+
+    def __init__(self, folder, pattern='*.gpkg', interval=JEDA_POLLING, debounce=JEDA_STABIL, clock=time.monotonic):
+        self.folder = Path(folder)
+        self.pattern = pattern
+        self.interval = interval
+        self.debounce = debounce
+        self.clock = clock
+        self.dicek = {}  # path -> signature saat terakhir dicek
+        self._tertunda = {}  # path -> (signature, waktu pertama terlihat dengan signature itu)
+
+    def mark_checked(self, path, signature):
+        self.dicek[Path(path)] = signature
+        self._tertunda.pop(Path(path), None)
+
+    def poll(self):
+        sekarang = self.clock()
+        siap, terlihat = [], set()
+        for path in sorted(self.folder.glob(self.pattern)):
+            tanda = sls_cache.file_signature(path)
+            if tanda is None:
+                continue
+            terlihat.add(path)
+            if self.dicek.get(path) == tanda:
+                self._tertunda.pop(path, None)
+                continue
+            lama = self._tertunda.get(path)
+            if lama is None or lama[0] != tanda:
+                # Baru muncul atau masih berubah: tunggu sampai stabil
+                self._tertunda[path] = (tanda, sekarang)
+            elif sekarang - lama[1] >= self.debounce:
+                siap.append((path, tanda))
+        # File yang dihapus tidak perlu diingat lagi
+        for path in (set(self.dicek) | set(self._tertunda)) - terlihat:
+            self.dicek.pop(path, None)
+            self._tertunda.pop(path, None)
+        return siap
+
+    def run(self, handler, stop=None):
+        """Panggil ``handler(path)`` untuk setiap file yang berubah hingga ``stop`` (threading.Event) di-set.
+
+        File ditandai sudah dicek meskipun handler gagal, sehingga file yang
+        rusak tidak dicek berulang-ulang sampai file itu berubah lagi.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for path, tanda in self.poll():
+                if stop.is_set():
+                    break
+                try:
+                    handler(path)
+                finally:
+                    self.mark_checked(path, tanda)
+            stop.wait(self.interval)
+
+
+class MasterPool:
+    """Index Master yang tetap di memori selama mode pantau.
+
+    ``loader(excel_path)`` hanya dipanggil saat Master pertama kali dipakai
+    atau saat file Excel-nya berubah (ukuran/mtime).
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self._isi = {}  # path absolut -> (signature, master)
+
+    def get(self, excel_path):
+        path = Path(excel_path).resolve()
+        tanda = sls_cache.file_signature(path)
+        ada = self._isi.get(path)
+        if ada is not None and ada[0] == tanda:
+            return ada[1]
+        master = self.loader(path)
+        self._isi[path] = (tanda, master)
+        return master
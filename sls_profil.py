@@ -0,0 +1,211 @@
+"""Instrumentasi per fase pipeline pengecekan: waktu, memori, dan cProfile/tracemalloc opsional.
+
+Fase ditandai di kode dengan ``with sls_profil.phase("nama"):``. Tanpa
+profiler aktif, blok itu tidak melakukan apa-apa. Profiler diaktifkan
+untuk satu run dengan ``with profiler.activate():`` dan berlaku untuk
+semua thread (misalnya pemuatan Master dan GeoPackage yang bersamaan).
+
+Pengaturan lewat variabel lingkungan ``SLS_PROFIL`` (dipisah koma):
+``cprofile`` dan/atau ``tracemalloc``.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+# Jumlah laporan run otomatis (run_*.json) yang disimpan di folder profil
+MAKS_LAPORAN = 20
+
+_aktif = None
+_kunci = threading.Lock()
+
+
+def rss_mb():
+    """RSS proses saat ini dalam MB (None jika tidak dapat diukur)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb():
+    """Peak RSS proses ini dalam MB (None jika tidak dapat diukur)."""
+    try:
+        import resource
+    except ImportError:
+        # Windows: pakai psutil jika terpasang
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2 ** 20
+        except (ImportError, AttributeError):
+            return None
+    maks = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maks / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+
+def settings_from_env():
+    """Baca SLS_PROFIL menjadi argumen RunProfiler."""
+    pilihan = {p.strip().lower() for p in os.environ.get('SLS_PROFIL', '').split(',')}
+    return {'cprofile': 'cprofile' in pilihan, 'tracemalloc': 'tracemalloc' in pilihan}
+
+
+def phase(nama):
+    """Context manager pengukur satu fase; no-op jika tidak ada profiler aktif."""
+    profiler = _aktif
+    return profiler.phase(nama) if profiler is not None else nullcontext()
+
+
+class RunProfiler:
+    """Kumpulkan waktu dan memori per fase satu run, lalu susun laporan JSON/log."""
+
+    def __init__(self, cprofile=False, tracemalloc=False):
+        self.pakai_cprofile = cprofile
+        self.pakai_tracemalloc = tracemalloc
+        self.fase = []
+        self.info = {}
+        self._profil = None
+        self._profil_thread = []
+        self._thread = None
+        self._mulai = None
+        self._selesai = None
+
+    @contextmanager
+    def phase(self, nama):
+        # cProfile hanya merekam thread yang memanggil enable(); fase di thread lain diprofil sendiri
+        profil = None
+        if self._profil is not None and threading.get_ident() != self._thread:
+            profil = cProfile.Profile()
+            profil.enable()
+        rss_awal = rss_mb()
+        mulai = time.perf_counter()
+        try:
+            yield
+        finally:
+            detik = time.perf_counter() - mulai
+            if profil is not None:
+                profil.disable()
+                with _kunci:
+                    self._profil_thread.append(profil)
+            rss_akhir = rss_mb()
+            catatan = {
+                'fase': nama,
+                'mulai_detik': round(mulai - self._mulai, 4) if self._mulai else 0.0,
+                'detik': round(detik, 4),
+                'rss_mb': round(rss_akhir, 1) if rss_akhir is not None else None,
+                'rss_delta_mb': round(rss_akhir - rss_awal, 1) if None not in (rss_awal, rss_akhir) else None,
+                'thread': threading.current_thread().name,
+            }
+            if self.pakai_tracemalloc and tracemalloc.is_tracing():
+                # Puncak sejak awal run (fase bisa berjalan bersamaan, jadi tidak di-reset per fase)
+                catatan['tracemalloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+            with _kunci:
+                self.fase.append(catatan)
+
+    @contextmanager
+    def activate(self):
+        """Aktifkan profiler ini untuk seluruh kode di dalam blok with."""
+        global _aktif
+        _aktif = self
+        self._mulai = time.perf_counter()
+        if self.pakai_tracemalloc:
+            tracemalloc.start()
+        if self.pakai_cprofile:
+            self._thread = threading.get_ident()
+            self._profil = cProfile.Profile()
+            self._profil.enable()
+        try:
+            yield self
+        finally:
+            if self._profil is not None:
+                self._profil.disable()
+            if self.pakai_tracemalloc:
+                self.info['tracemalloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+                tracemalloc.stop()
+            self._selesai = time.perf_counter()
+            _aktif = None
+
+    def report(self, top=20):
+        """Laporan run terstruktur (dict yang dapat ditulis sebagai JSON)."""
+        laporan = {
+            'waktu': datetime.now().isoformat(timespec='seconds'),
+            'total_detik': round((self._selesai or time.perf_counter()) - self._mulai, 4) if self._mulai else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'fase': sorted(self.fase, key=lambda f: f['mulai_detik']),
+            **self.info,
+        }
+        if self._profil is not None:
+            laporan['cprofile_top'] = self.top_functions(top)
+        return laporan
+
+    def _stats(self):
+        stats = pstats.Stats(self._profil, stream=io.StringIO())
+        for profil in self._profil_thread:
+            stats.add(profil)
+        return stats
+
+    def top_functions(self, top=20):
+        """Fungsi dengan waktu kumulatif terbesar dari capture cProfile (semua thread)."""
+        stats = self._stats()
+        baris = []
+        for (berkas, nomor, fungsi), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            baris.append({'fungsi': f"{Path(berkas).name}:{nomor}({fungsi})", 'panggilan': ncalls,
+                          'tottime': round(tottime, 4), 'cumtime': round(cumtime, 4)})
+        return sorted(baris, key=lambda b: b['cumtime'], reverse=True)[:top]
+
+    def write_json(self, path):
+        Path(path).write_text(json.dumps(self.report(), indent=2, ensure_ascii=False), encoding='utf-8')
+
+    def write_pstats(self, path):
+        """Simpan capture cProfile (untuk snakeviz/pstats); tidak melakukan apa-apa tanpa cProfile."""
+        if self._profil is not None:
+            self._stats().dump_stats(str(path))
+
+    def format_lines(self):
+        """Baris teks bagian Performance untuk log GUI atau konsol."""
+        laporan = self.report(top=5)
+        lines = ["\n=== PERFORMANCE ==="]
+        for f in laporan['fase']:
+            memori = f"RSS {f['rss_mb']:.0f} MB ({f['rss_delta_mb']:+.0f})" if f['rss_mb'] is not None else ""
+            lines.append(f"{f['fase']:<28} {f['detik']:>8.2f} detik  {memori}")
+        if laporan['total_detik'] is not None:
+            lines.append(f"{'Total':<28} {laporan['total_detik']:>8.2f} detik")
+        if laporan['peak_rss_mb'] is not None:
+            lines.append(f"Peak RSS: {laporan['peak_rss_mb']:.0f} MB")
+        if 'tracemalloc_peak_mb' in laporan:
+            lines.append(f"Peak alokasi Python (tracemalloc): {laporan['tracemalloc_peak_mb']:.0f} MB")
+        for f in laporan.get('cprofile_top', []):
+            lines.append(f"  {f['cumtime']:>8.2f} detik  {f['fungsi']}")
+        return lines
+
+
+def save_report(profiler, folder, nama=None, simpan=MAKS_LAPORAN):
+    """Simpan laporan JSON (dan .pstats jika cProfile aktif); kembalikan path JSON, atau None jika gagal.
+
+    Hanya ``simpan`` laporan run_* terbaru yang dipertahankan di folder.
+    """
+    folder = Path(folder)
+    path = folder / f"{nama or datetime.now().strftime('run_%Y%m%d_%H%M%S')}.json"
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        profiler.write_json(path)
+        profiler.write_pstats(path.with_suffix('.pstats'))
+        for lama in sorted(folder.glob('run_*.json'))[:-simpan]:
+            lama.unlink(missing_ok=True)
+            lama.with_suffix('.pstats').unlink(missing_ok=True)
+    except OSError:
+        return None
+    return path
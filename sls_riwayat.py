@@ -0,0 +1,316 @@
+"""Riwayat run pengecekan di database SQLite lokal (satu file, sepenuhnya offline).
+
+Setiap run menyimpan ringkasan, laporan digit/duplikasi, dan seluruh baris
+hasilnya. Tabel ``hasil`` diindeks per (run, idsubsls) dan (run, status)
+sehingga pertanyaan seperti "SLS mana yang tidak cocok di 5 run terakhir"
+atau "beda run A dan run B" dijawab lewat index, tanpa memuat ulang CSV.
+
+Contoh:
+    python sls_riwayat.py daftar
+    python sls_riwayat.py tidak-cocok --run 5 --minimal 3
+    python sls_riwayat.py diff 12 15 --output beda_12_15.csv
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import sls_cache
+import sls_checker
+import sls_profil
+
+# Naikkan jika skema tabel berubah; database dengan versi lain dibuat ulang
+VERSI_SKEMA = 2
+
+# Jumlah run yang disimpan; run paling lama dihapus beserta baris hasilnya
+MAKS_RUN = 20
+
+# Kolom teks hasil -> kolom tabel hasil (Status, Duplikasi, dan Jenis_Beda_NMSLS disimpan sebagai kode kategori)
+KOLOM_TEKS = {
+    'IDSUB_SLS': 'idsubsls', 'NMSLS_GPKG': 'nmsls_gpkg', 'NMSLS_MASTER': 'nmsls_master',
+    'KDSUBSLS_GPKG': 'kdsubsls_gpkg', 'KDSUBSLS_GPKG_ORIGINAL': 'kdsubsls_gpkg_original',
+    'KDSUBSLS_MASTER': 'kdsubsls_master', 'KDSUBSLS_MASTER_ORIGINAL': 'kdsubsls_master_original',
+}
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY,
+    waktu TEXT NOT NULL,
+    gpkg_path TEXT,
+    excel_path TEXT,
+    mode TEXT,
+    total INTEGER,
+    ketidakcocokan INTEGER,
+    detik REAL,
+    ringkasan TEXT,
+    laporan TEXT
+);
+CREATE TABLE IF NOT EXISTS status (kode INTEGER PRIMARY KEY, nama TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS duplikasi (kode INTEGER PRIMARY KEY, nama TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS jenis_beda_nmsls (kode INTEGER PRIMARY KEY, nama TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS hasil (
+    run_id INTEGER NOT NULL REFERENCES run(id) ON DELETE CASCADE,
+    idsubsls TEXT,
+    nmsls_gpkg TEXT,
+    nmsls_master TEXT,
+    kdsubsls_gpkg TEXT,
+    kdsubsls_gpkg_original TEXT,
+    kdsubsls_master TEXT,
+    kdsubsls_master_original TEXT,
+    duplikasi INTEGER,
+    status INTEGER,
+    jenis_beda_nmsls INTEGER
+);
+CREATE INDEX IF NOT EXISTS hasil_run_id ON hasil (run_id, idsubsls);
+CREATE INDEX IF NOT EXISTS hasil_run_status ON hasil (run_id, status);
+CREATE INDEX IF NOT EXISTS hasil_id ON hasil (idsubsls);
+CREATE INDEX IF NOT EXISTS run_gpkg ON run (gpkg_path, id);
+CREATE VIEW IF NOT EXISTS hasil_teks AS
+    SELECT h.run_id, h.idsubsls, h.nmsls_gpkg, h.nmsls_master, h.kdsubsls_gpkg, h.kdsubsls_master,
+           d.nama AS duplikasi, s.nama AS status, j.nama AS jenis_beda_nmsls
+    FROM hasil h JOIN status s ON s.kode = h.status JOIN duplikasi d ON d.kode = h.duplikasi
+    LEFT JOIN jenis_beda_nmsls j ON j.kode = h.jenis_beda_nmsls;
+"""
+
+# Status satu idsubsls per run: kode terbesar jika ada beberapa baris (duplikat)
+_STATUS_PER_ID = "SELECT idsubsls, MAX(status) AS status FROM hasil WHERE run_id = ? GROUP BY idsubsls"
+
+
+def default_history_path():
+    """File database riwayat di folder cache per pengguna."""
+    return sls_cache.default_cache_dir() / 'riwayat.sqlite'
+
+
+def _path_teks(path):
+    return str(Path(path).resolve()) if path else None
+
+
+def _nama_status(kode):
+    return sls_checker.KATEGORI_STATUS[int(kode)] if pd.notna(kode) else None
+
+
+class HistoryStore:
+    """Simpan dan kueri riwayat run pengecekan di satu file SQLite.
+
+    Koneksi dibuka per objek; pakai satu objek per thread (objek dibuat di
+    thread worker saat menyimpan, dan di thread GUI/CLI saat mengkueri).
+    """
+
+    def __init__(self, db_path=None, max_runs=MAKS_RUN):
+        self.db_path = Path(db_path) if db_path else default_history_path()
+        self.max_runs = max_runs
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._siapkan_skema()
+
+    def _siapkan_skema(self):
+        versi = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if versi not in (0, VERSI_SKEMA):
+            # Riwayat hanya arsip lokal: skema lama dibuang daripada dimigrasi
+            with self.conn:
+                self.conn.execute("DROP VIEW IF EXISTS hasil_teks")
+                for tabel in ('hasil', 'run', 'status', 'duplikasi', 'jenis_beda_nmsls'):
+                    self.conn.execute(f"DROP TABLE IF EXISTS {tabel}")
+        with self.conn:
+            self.conn.executescript(SKEMA)
+            self.conn.executemany("INSERT OR REPLACE INTO status VALUES (?, ?)",
+                                  enumerate(sls_checker.KATEGORI_STATUS))
+            self.conn.executemany("INSERT OR REPLACE INTO duplikasi VALUES (?, ?)",
+                                  enumerate(sls_checker.KATEGORI_DUPLIKASI))
+            self.conn.executemany("INSERT OR REPLACE INTO jenis_beda_nmsls VALUES (?, ?)",
+                                  enumerate(sls_checker.KATEGORI_BEDA_NMSLS))
+            self.conn.execute(f"PRAGMA user_version={VERSI_SKEMA}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # --- Simpan ---
+    def record_run(self, hasil, gpkg_path=None, excel_path=None, laporan=(), ringkasan=None, mode='penuh',
+                   detik=None):
+        """Simpan satu run (DataFrame hasil, laporan, ringkasan) dan kembalikan id run-nya.
+
+        Setelah disimpan, run di luar ``max_runs`` terbaru dihapus.
+        """
+        if ringkasan is None:
+            ringkasan = sls_checker.summarize(hasil)
+        status = pd.Categorical(hasil['Status'], categories=sls_checker.KATEGORI_STATUS).codes
+        duplikasi = pd.Categorical(hasil['Duplikasi_idsubsls'], categories=sls_checker.KATEGORI_DUPLIKASI).codes
+        jenis_nmsls = pd.Categorical(hasil['Jenis_Beda_NMSLS'], categories=sls_checker.KATEGORI_BEDA_NMSLS).codes
+        teks = [hasil[kolom].astype(object).where(hasil[kolom].notna(), None).to_numpy() for kolom in KOLOM_TEKS]
+
+        with sls_profil.phase("Simpan riwayat"), self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO run (waktu, gpkg_path, excel_path, mode, total, ketidakcocokan, detik, ringkasan, laporan)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), _path_teks(gpkg_path), _path_teks(excel_path), mode,
+                 ringkasan['total'], ringkasan['ketidakcocokan'], detik,
+                 json.dumps(ringkasan, ensure_ascii=False), json.dumps(list(laporan), ensure_ascii=False, default=str)),
+            ).lastrowid
+            # Kode -1 (nilai di luar kategori) disimpan sebagai NULL
+            baris = zip([run_id] * len(hasil), *teks,
+                        (int(k) if k >= 0 else None for k in duplikasi),
+                        (int(k) if k >= 0 else None for k in status),
+                        (int(k) if k >= 0 else None for k in jenis_nmsls))
+            self.conn.executemany("INSERT INTO hasil VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", baris)
+        if self.max_runs:
+            self.prune(self.max_runs)
+        return run_id
+
+    def delete_run(self, run_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM run WHERE id = ?", (int(run_id),))
+
+    def prune(self, keep):
+        """Hapus run lama sehingga tersisa ``keep`` run terbaru."""
+        with self.conn:
+            self.conn.execute("DELETE FROM run WHERE id NOT IN (SELECT id FROM run ORDER BY id DESC LIMIT ?)", (keep,))
+
+    # --- Kueri ---
+    def runs(self, limit=None, gpkg_path=None):
+        """Daftar run terbaru (tanpa baris hasil) sebagai DataFrame."""
+        sql = "SELECT id, waktu, gpkg_path, excel_path, mode, total, ketidakcocokan, detik FROM run"
+        parameter = []
+        if gpkg_path:
+            sql += " WHERE gpkg_path = ?"
+            parameter.append(_path_teks(gpkg_path))
+        sql += " ORDER BY id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            parameter.append(limit)
+        return pd.read_sql_query(sql, self.conn, params=parameter)
+
+    def _run_terakhir(self, jumlah, gpkg_path=None):
+        return self.runs(jumlah, gpkg_path)['id'].tolist()
+
+    def load_result(self, run_id, status=None):
+        """Muat ulang satu run sebagai CheckResult; ``status`` membatasi ke satu kategori."""
+        info = self.conn.execute("SELECT ringkasan, laporan FROM run WHERE id = ?", (int(run_id),)).fetchone()
+        if info is None:
+            raise KeyError(f"Run {run_id} tidak ada di riwayat")
+        sql = "SELECT * FROM hasil WHERE run_id = ?"
+        parameter = [int(run_id)]
+        if status is not None:
+            sql += " AND status = ?"
+            parameter.append(sls_checker.KATEGORI_STATUS.index(status))
+        data = pd.read_sql_query(sql + " ORDER BY rowid", self.conn, params=parameter)
+        hasil = pd.DataFrame({kolom: data[nama] for kolom, nama in KOLOM_TEKS.items()})
+        hasil['Duplikasi_idsubsls'] = pd.Categorical.from_codes(
+            data['duplikasi'].fillna(-1).astype(int), sls_checker.KATEGORI_DUPLIKASI)
+        hasil['Status'] = pd.Categorical.from_codes(data['status'].fillna(-1).astype(int),
+                                                    sls_checker.KATEGORI_STATUS)
+        hasil['Jenis_Beda_NMSLS'] = pd.Categorical.from_codes(data['jenis_beda_nmsls'].fillna(-1).astype(int),
+                                                              sls_checker.KATEGORI_BEDA_NMSLS)
+        ringkasan = json.loads(info[0])
+        ringkasan['contoh_ketidakcocokan'] = [tuple(c) for c in ringkasan['contoh_ketidakcocokan']]
+        return sls_checker.CheckResult(hasil, json.loads(info[1]), ringkasan if status is None else None)
+
+    def mismatched_in_last(self, jumlah_run=5, minimal=1, gpkg_path=None):
+        """idsubsls yang tidak 'Sesuai' di minimal ``minimal`` dari ``jumlah_run`` run terakhir.
+
+        ``status_terakhir`` adalah status di run terbaru (bisa 'Sesuai' jika
+        sudah diperbaiki, atau kosong jika idsubsls tidak ada di run itu).
+        """
+        run_ids = self._run_terakhir(jumlah_run, gpkg_path)
+        if not run_ids:
+            return pd.DataFrame(columns=['idsubsls', 'jumlah_run', 'run_pertama', 'run_terakhir', 'status_terakhir'])
+        tanda = ','.join('?' * len(run_ids))
+        data = pd.read_sql_query(
+            f"WITH terbaru AS ({_STATUS_PER_ID})"
+            f" SELECT h.idsubsls, COUNT(DISTINCT h.run_id) AS jumlah_run, MIN(h.run_id) AS run_pertama,"
+            f" MAX(h.run_id) AS run_terakhir, terbaru.status AS status_terakhir"
+            f" FROM hasil h LEFT JOIN terbaru USING (idsubsls)"
+            f" WHERE h.run_id IN ({tanda}) AND h.status > 0"
+            f" GROUP BY h.idsubsls HAVING COUNT(DISTINCT h.run_id) >= ?"
+            f" ORDER BY jumlah_run DESC, h.idsubsls",
+            self.conn, params=[run_ids[0], *run_ids, minimal])
+        data['status_terakhir'] = data['status_terakhir'].map(_nama_status)
+        return data
+
+    def diff_runs(self, run_a, run_b):
+        """idsubsls yang statusnya berbeda antara run A dan run B, termasuk yang hanya ada di salah satunya."""
+        data = pd.read_sql_query(
+            f"WITH a AS ({_STATUS_PER_ID}), b AS ({_STATUS_PER_ID})"
+            " SELECT a.idsubsls, a.status AS status_a, b.status AS status_b FROM a LEFT JOIN b USING (idsubsls)"
+            " WHERE b.status IS NULL OR a.status != b.status"
+            " UNION ALL"
+            " SELECT b.idsubsls, NULL, b.status FROM b LEFT JOIN a USING (idsubsls) WHERE a.idsubsls IS NULL"
+            " ORDER BY 1",
+            self.conn, params=[int(run_a), int(run_b)])
+        hanya_a, hanya_b = data['status_b'].isna(), data['status_a'].isna()
+        data['perubahan'] = 'Status berubah'
+        data.loc[hanya_a, 'perubahan'] = f"Hanya di run {run_a}"
+        data.loc[hanya_b, 'perubahan'] = f"Hanya di run {run_b}"
+        for kolom in ('status_a', 'status_b'):
+            data[kolom] = data[kolom].map(_nama_status)
+        return data
+
+    def history_of(self, idsubsls, jumlah_run=None):
+        """Status satu idsubsls di setiap run (terbaru dulu)."""
+        sql = ("SELECT r.id AS run_id, r.waktu, r.gpkg_path, s.nama AS status FROM hasil h"
+               " JOIN run r ON r.id = h.run_id JOIN status s ON s.kode = h.status"
+               " WHERE h.idsubsls = ? ORDER BY r.id DESC")
+        parameter = [idsubsls]
+        if jumlah_run:
+            sql += " LIMIT ?"
+            parameter.append(jumlah_run)
+        return pd.read_sql_query(sql, self.conn, params=parameter)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Kueri riwayat run pengecekan konsistensi SLS.")
+    parser.add_argument('--db', help="File database riwayat (default: di folder cache)")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+    daftar = sub.add_parser('daftar', help="Daftar run terbaru")
+    daftar.add_argument('--jumlah', type=int, default=20)
+    daftar.add_argument('--gpkg', help="Hanya run untuk GeoPackage ini")
+    tidak_cocok = sub.add_parser('tidak-cocok', help="SLS yang tidak cocok di N run terakhir")
+    tidak_cocok.add_argument('--run', type=int, default=5, help="Jumlah run terakhir (default: 5)")
+    tidak_cocok.add_argument('--minimal', type=int, default=1, help="Minimal jumlah run tidak cocok (default: 1)")
+    tidak_cocok.add_argument('--gpkg', help="Hanya run untuk GeoPackage ini")
+    tidak_cocok.add_argument('--output', help="Tulis hasil ke CSV")
+    diff = sub.add_parser('diff', help="Beda status antara dua run")
+    diff.add_argument('run_a', type=int)
+    diff.add_argument('run_b', type=int)
+    diff.add_argument('--output', help="Tulis hasil ke CSV")
+    sls = sub.add_parser('sls', help="Riwayat status satu idsubsls")
+    sls.add_argument('idsubsls')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    mulai = time.perf_counter()
+    with HistoryStore(args.db) as riwayat:
+        if args.perintah == 'daftar':
+            data = riwayat.runs(args.jumlah, args.gpkg)
+        elif args.perintah == 'tidak-cocok':
+            data = riwayat.mismatched_in_last(args.run, args.minimal, args.gpkg)
+        elif args.perintah == 'diff':
+            data = riwayat.diff_runs(args.run_a, args.run_b)
+        else:
+            data = riwayat.history_of(args.idsubsls)
+    if getattr(args, 'output', None):
+        data.to_csv(args.output, index=False)
+        print(f"{len(data)} baris ditulis ke {args.output}")
+    else:
+        print(data.to_string(index=False, max_rows=50) if len(data) else "(kosong)")
+    print(f"({time.perf_counter() - mulai:.2f} detik)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
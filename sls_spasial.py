@@ -0,0 +1,287 @@
+"""Cek konsistensi spasial poligon SLS di GeoPackage.
+
+Pemeriksaan (semuanya vektor memakai shapely 2 dan STRtree ``sindex``):
+
+- geometri tidak valid (self-intersection, ring tidak tertutup, dst.) atau kosong;
+- overlap antar SLS: pasangan kandidat dari satu ``sindex.query`` massal,
+  lalu dibuang yang hanya bersinggungan di batas atau yang luas irisannya
+  sangat kecil dibanding poligon terkecil (sisa digitasi);
+- celah: lubang pada gabungan poligon satu kecamatan;
+- sub-SLS di luar induk: poligon kdsubsls selain '00' yang sebagian luasnya
+  berada di luar poligon SLS induknya (idsubsls sama dengan akhiran '00'),
+  jika induk itu ada di GeoPackage.
+
+Pemeriksaan dijalankan paralel per kecamatan (7 digit awal idsubsls);
+overlap antar poligon dari kecamatan berbeda dicek sekali di proses utama.
+Celah di perbatasan antar kecamatan tidak terdeteksi.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import sls_checker
+import sls_profil
+
+JENIS_MASALAH = ('Geometri Tidak Valid', 'Overlap', 'Celah', 'Sub-SLS di Luar Induk')
+
+KOLOM_MASALAH = ['jenis', 'idsubsls', 'idsubsls_lain', 'luas', 'rasio', 'keterangan', 'x', 'y']
+
+# Overlap dilaporkan jika luas irisan > rasio ini terhadap poligon yang lebih kecil
+BATAS_RASIO_OVERLAP = 0.001
+
+# Celah dilaporkan jika luasnya > rasio ini terhadap median luas poligon di kecamatannya
+BATAS_RASIO_CELAH = 0.001
+
+# Sub-SLS dilaporkan jika bagian di luar induknya > rasio ini terhadap luasnya sendiri
+BATAS_RASIO_LUAR_INDUK = 0.01
+
+# Di bawah jumlah fitur ini pemeriksaan dijalankan di satu proses saja
+MIN_FITUR_PARALEL = 20000
+
+
+def read_gpkg_geometries(gpkg_path):
+    """Baca idsubsls dan geometri GeoPackage sebagai GeoDataFrame (pyogrio, Arrow jika tersedia)."""
+    import geopandas as gpd
+
+    try:
+        import pyarrow  # noqa: F401
+        pakai_arrow = True
+    except ImportError:
+        pakai_arrow = False
+    with sls_profil.phase("Baca geometri GeoPackage"):
+        gdf = gpd.read_file(gpkg_path, columns=['idsubsls'], engine='pyogrio', use_arrow=pakai_arrow)
+    if 'idsubsls' not in gdf.columns:
+        gdf['idsubsls'] = ''
+    gdf['idsubsls'] = sls_checker.clean_text(gdf['idsubsls'], '').to_numpy(dtype=object)
+    return gdf
+
+
+def _masalah(jenis, idsubsls, idsubsls_lain, luas, rasio, keterangan, titik):
+    """DataFrame masalah dengan kolom KOLOM_MASALAH; titik adalah geometri lokasi masalah."""
+    import shapely
+
+    titik = shapely.point_on_surface(np.asarray(titik, dtype=object))
+    return pd.DataFrame({
+        'jenis': jenis,
+        'idsubsls': idsubsls,
+        'idsubsls_lain': idsubsls_lain,
+        'luas': luas,
+        'rasio': np.round(rasio, 4),
+        'keterangan': keterangan,
+        'x': shapely.get_x(titik),
+        'y': shapely.get_y(titik),
+    }, columns=KOLOM_MASALAH)
+
+
+def _cek_overlap(ids, geoms, luas, kiri, kanan):
+    """Saring pasangan kandidat (kiri, kanan) dari sindex menjadi overlap yang sebenarnya."""
+    import shapely
+
+    if len(kiri) == 0:
+        # Satu poligon, poligon yang saling lepas, atau kecamatan yang tidak bersinggungan
+        return _masalah('Overlap', [], [], [], [], [], np.array([], dtype=object))
+    # Induk '00' dan sub-SLS-nya memang bertumpuk
+    sls_kiri, sls_kanan = ids[kiri].astype(str), ids[kanan].astype(str)
+    induk_kiri = np.char.endswith(sls_kiri, '00')
+    induk_kanan = np.char.endswith(sls_kanan, '00')
+    sama_sls = np.char.ljust(sls_kiri, 16).astype('U14') == np.char.ljust(sls_kanan, 16).astype('U14')
+    pilih = ~(sama_sls & (induk_kiri ^ induk_kanan))
+    kiri, kanan = kiri[pilih], kanan[pilih]
+    # Hanya bersinggungan di batas bukan overlap
+    dalam = ~shapely.touches(geoms[kiri], geoms[kanan])
+    kiri, kanan = kiri[dalam], kanan[dalam]
+
+    irisan = shapely.intersection(geoms[kiri], geoms[kanan])
+    luas_irisan = shapely.area(irisan)
+    rasio = luas_irisan / np.maximum(np.minimum(luas[kiri], luas[kanan]), np.finfo(float).tiny)
+    nyata = rasio > BATAS_RASIO_OVERLAP
+    return _masalah('Overlap', ids[kiri[nyata]], ids[kanan[nyata]], luas_irisan[nyata], rasio[nyata],
+                    'Irisan dengan poligon lain', irisan[nyata])
+
+
+def _cek_celah(ids, geoms, luas, tree):
+    """Lubang pada gabungan poligon (satu kecamatan) beserta SLS yang mengelilinginya."""
+    import shapely
+
+    poligon = shapely.get_type_id(geoms) >= 3  # Polygon/MultiPolygon
+    if not poligon.any():
+        return _masalah('Celah', [], [], [], [], [], np.array([], dtype=object))
+    gabungan = shapely.union_all(geoms[poligon])
+    bagian = shapely.get_parts(gabungan)
+    bagian = bagian[shapely.get_type_id(bagian) == 3]
+    jumlah_ring = shapely.get_num_interior_rings(bagian)
+    asal = np.repeat(np.arange(len(bagian)), jumlah_ring)
+    ke = np.arange(jumlah_ring.sum()) - np.repeat(np.cumsum(jumlah_ring) - jumlah_ring, jumlah_ring)
+    celah = shapely.polygons(shapely.get_interior_ring(bagian[asal], ke))
+    luas_celah = shapely.area(celah)
+
+    acuan = max(float(np.median(luas[poligon])), np.finfo(float).tiny)
+    rasio = luas_celah / acuan
+    nyata = rasio > BATAS_RASIO_CELAH
+    celah, luas_celah, rasio = celah[nyata], luas_celah[nyata], rasio[nyata]
+
+    # SLS di sekeliling celah, dari satu query massal
+    posisi_celah, posisi_sls = tree.query(celah, predicate='intersects')
+    tetangga = pd.Series(ids[posisi_sls]).groupby(posisi_celah).agg(lambda s: ', '.join(sorted(set(s))[:5]))
+    tetangga = tetangga.reindex(range(len(celah)), fill_value='')
+    return _masalah('Celah', tetangga.to_numpy(dtype=object), '', luas_celah, rasio,
+                    'Lubang di antara poligon SLS (rasio terhadap median luas SLS)', celah)
+
+
+def _cek_luar_induk(ids, geoms, luas):
+    """Sub-SLS yang sebagian luasnya berada di luar poligon induk '00'-nya."""
+    import shapely
+
+    teks = ids.astype(str)
+    anak = np.flatnonzero((np.char.str_len(teks) == 16) & ~np.char.endswith(teks, '00'))
+    # Posisi fitur pertama untuk setiap idsubsls
+    pertama = ~pd.Index(teks).duplicated()
+    posisi_id = pd.Series(np.flatnonzero(pertama), index=teks[pertama])
+    induk = posisi_id.reindex(np.char.add(teks[anak].astype('U14'), '00')).to_numpy()
+    ada = ~np.isnan(induk)
+    anak, induk = anak[ada], induk[ada].astype(np.int64)
+
+    luar = shapely.difference(geoms[anak], geoms[induk])
+    luas_luar = shapely.area(luar)
+    rasio = luas_luar / np.maximum(luas[anak], np.finfo(float).tiny)
+    nyata = rasio > BATAS_RASIO_LUAR_INDUK
+    return _masalah('Sub-SLS di Luar Induk', ids[anak[nyata]], ids[induk[nyata]], luas_luar[nyata], rasio[nyata],
+                    'Bagian sub-SLS di luar poligon SLS induk (rasio terhadap luas sub-SLS)', luar[nyata]), len(anak)
+
+
+def _cek_partisi_spasial(nama, ids, geoms):
+    """Semua pemeriksaan untuk satu kecamatan; dijalankan di proses worker."""
+    import geopandas as gpd
+    import shapely
+
+    mulai = time.perf_counter()
+    geoms = np.asarray(geoms, dtype=object)
+    bagian = []
+
+    kosong = shapely.is_missing(geoms) | shapely.is_empty(geoms)
+    tidak_valid = ~kosong & ~shapely.is_valid(geoms)
+    posisi = np.flatnonzero(tidak_valid | kosong)
+    alasan = np.where(kosong[posisi], 'Geometri kosong', '').astype(object)
+    if tidak_valid.any():
+        alasan[tidak_valid[posisi]] = shapely.is_valid_reason(geoms[tidak_valid])
+    bagian.append(_masalah('Geometri Tidak Valid', ids[posisi], '', np.nan, np.nan, alasan,
+                           np.where(kosong[posisi], None, geoms[posisi])))
+    # Pemeriksaan berikutnya memakai versi yang sudah diperbaiki
+    geoms = geoms.copy()
+    geoms[tidak_valid] = shapely.make_valid(geoms[tidak_valid])
+    luas = shapely.area(geoms)
+
+    tree = gpd.GeoSeries(geoms).sindex
+    kiri, kanan = tree.query(geoms, predicate='intersects')
+    pilih = kiri < kanan
+    bagian.append(_cek_overlap(ids, geoms, luas, kiri[pilih], kanan[pilih]))
+    bagian.append(_cek_celah(ids, geoms, luas, tree))
+    luar_induk, sub_dicek = _cek_luar_induk(ids, geoms, luas)
+    bagian.append(luar_induk)
+    return {
+        'nama': nama,
+        'masalah': pd.concat([b for b in bagian if len(b)], ignore_index=True) if any(len(b) for b in bagian)
+        else pd.DataFrame(columns=KOLOM_MASALAH),
+        'fitur': len(geoms),
+        'sub_dicek': sub_dicek,
+        'detik': time.perf_counter() - mulai,
+    }
+
+
+def _overlap_antar_kecamatan(ids, geoms, kecamatan):
+    """Overlap antar poligon dari kecamatan berbeda, dari satu query sindex atas seluruh file."""
+    import geopandas as gpd
+    import shapely
+
+    valid = geoms.copy()
+    rusak = ~shapely.is_valid(valid) & ~shapely.is_missing(valid)
+    valid[rusak] = shapely.make_valid(valid[rusak])
+    kiri, kanan = gpd.GeoSeries(valid).sindex.query(valid, predicate='intersects')
+    pilih = (kiri < kanan) & (kecamatan[kiri] != kecamatan[kanan])
+    return _cek_overlap(ids, valid, shapely.area(valid), kiri[pilih], kanan[pilih])
+
+
+def check_spatial(gpkg_path, max_workers=None, progress=None, meter=None, cancel=None, gdf=None):
+    """Jalankan semua pemeriksaan spasial; kembalikan (DataFrame masalah, ringkasan dict)."""
+    lapor = progress or sls_checker.silent
+    meter = meter or sls_checker.silent
+    if gdf is None:
+        lapor("Membaca geometri GeoPackage untuk cek spasial...")
+        gdf = read_gpkg_geometries(gpkg_path)
+    sls_checker.check_cancel(cancel)
+
+    ids = gdf['idsubsls'].to_numpy(dtype=object)
+    geoms = gdf.geometry.to_numpy(dtype=object) if hasattr(gdf.geometry, 'to_numpy') else np.asarray(gdf.geometry)
+    kecamatan = ids.astype(str).astype('U7')  # 7 digit awal; aman untuk GeoPackage tanpa fitur
+    kelompok = pd.Series(kecamatan).groupby(kecamatan, sort=True).indices
+    workers = max_workers or os.cpu_count() or 1
+    lapor(f"Cek spasial {len(gdf)} poligon di {len(kelompok)} kecamatan...")
+
+    keluaran = []
+    meter("Cek spasial per kecamatan", 0, len(kelompok))
+    with sls_profil.phase("Cek spasial per kecamatan"):
+        if workers > 1 and len(kelompok) > 1 and len(gdf) >= MIN_FITUR_PARALEL:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_cek_partisi_spasial, kode, ids[posisi], geoms[posisi])
+                           for kode, posisi in kelompok.items()]
+                try:
+                    for future in as_completed(futures):
+                        keluaran.append(future.result())
+                        meter("Cek spasial per kecamatan", len(keluaran), len(kelompok))
+                        sls_checker.check_cancel(cancel)
+                except sls_checker.CheckCancelled:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+        else:
+            for kode, posisi in kelompok.items():
+                sls_checker.check_cancel(cancel)
+                keluaran.append(_cek_partisi_spasial(kode, ids[posisi], geoms[posisi]))
+                meter("Cek spasial per kecamatan", len(keluaran), len(kelompok))
+
+    bagian = [k['masalah'] for k in sorted(keluaran, key=lambda k: k['nama'])]
+    if len(kelompok) > 1:
+        sls_checker.check_cancel(cancel)
+        with sls_profil.phase("Overlap antar kecamatan"):
+            bagian.append(_overlap_antar_kecamatan(ids, geoms, kecamatan))
+    bagian = [b for b in bagian if len(b)]
+    masalah = pd.concat(bagian, ignore_index=True) if bagian else pd.DataFrame(columns=KOLOM_MASALAH)
+
+    per_jenis = masalah['jenis'].value_counts()
+    ringkasan = {
+        'fitur': len(gdf),
+        'kecamatan': len(kelompok),
+        'sub_dicek': sum(k['sub_dicek'] for k in keluaran),
+        **{jenis: int(per_jenis.get(jenis, 0)) for jenis in JENIS_MASALAH},
+    }
+    return masalah, ringkasan
+
+
+def format_spatial_summary(ringkasan):
+    """Baris teks ringkasan cek spasial untuk log GUI atau konsol."""
+    lines = ["\n=== CEK SPASIAL ===",
+             f"Poligon: {ringkasan['fitur']} di {ringkasan['kecamatan']} kecamatan"]
+    lines.extend(f"{jenis}: {ringkasan[jenis]}" for jenis in JENIS_MASALAH)
+    lines.append(f"(sub-SLS yang memiliki induk '00' dan dicek: {ringkasan['sub_dicek']})")
+    return lines
+
+
+def build_spatial_rows(masalah, ringkasan):
+    """Baris laporan (kolom KOLOM_HASIL) untuk bagian cek spasial."""
+    baris_laporan = sls_checker.report_row
+    rows = [baris_laporan(
+        IDSUB_SLS='=== CEK SPASIAL ===',
+        NMSLS_GPKG=f"Poligon: {ringkasan['fitur']}",
+        KDSUBSLS_GPKG=", ".join(f"{jenis}: {ringkasan[jenis]}" for jenis in JENIS_MASALAH),
+        Status='Laporan Spasial'
+    )]
+    for m in masalah.itertuples(index=False):
+        lokasi = f"x={m.x:.6f}, y={m.y:.6f}" if pd.notna(m.x) else ''
+        rasio = f", rasio {m.rasio}" if pd.notna(m.rasio) else ''
+        rows.append(baris_laporan(
+            IDSUB_SLS=m.idsubsls, NMSLS_GPKG=m.jenis, NMSLS_MASTER=m.idsubsls_lain,
+            KDSUBSLS_GPKG=f"{m.keterangan}{rasio}", KDSUBSLS_MASTER=lokasi, Status='Issue Spasial'
+        ))
+    return rows
@@ -0,0 +1,32 @@
+"""Regresi: laporan kandidat Master saat tidak ada satu pun kandidat."""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sls_checker  # noqa: E402
+
+
+@pytest.mark.parametrize('baris_master', [1, 0])
+def test_tanpa_kandidat_tidak_error(baris_master):
+    # kdsubsls '000' dan 3.0 tidak punya kelompok kdsubsls di Master; Master juga bisa kosong
+    master = sls_checker.prepare_master(pd.DataFrame({
+        'idsubsls': ['3201010001000100'][:baris_master],
+        'nmsls': ['RT 1'][:baris_master],
+        'kdsubsls': ['00'][:baris_master],
+    }))
+    gpkg = sls_checker.prepare_gpkg(pd.DataFrame({
+        'idsubsls': ['3201010001000201', '3201010001000301'],
+        'nmsls': ['RT 2', 'RT 3'],
+        'kdsubsls': ['000', 3.0],
+    }))
+    hasil = sls_checker.compare(master, gpkg)
+
+    rows = sls_checker.build_report_rows(master, gpkg, hasil)
+
+    kandidat = [r for r in rows if r['Status'] == 'Kandidat Master']
+    assert [r['IDSUB_SLS'] for r in kandidat] == ['3201010001000201', '3201010001000301']
+    assert all(r['KDSUBSLS_MASTER'] == "Tidak ada Master dengan kdsubsls yang sama" for r in kandidat)
@@ -0,0 +1,137 @@
+"""Regresi: mesin vektor menghasilkan baris yang sama dengan loop per baris sebelum vektorisasi.
+
+Baris yang diharapkan diambil dari CheckWorker.run versi lama pada fixture
+yang sama. Urutan bagian 'Tidak Ditemukan di GeoPackage' tidak dibandingkan
+karena loop lama mengiterasi set.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sls_checker  # noqa: E402
+
+gpd = pytest.importorskip('geopandas')
+pytest.importorskip('openpyxl')
+from shapely.geometry import Point  # noqa: E402
+
+KOLOM = [k for k in sls_checker.KOLOM_HASIL if k != 'Jenis_Beda_NMSLS']
+TIDAK_DI_GPKG = 'Tidak Ditemukan di GeoPackage'
+
+GPKG = {
+    # None, '' dilewati; '0' (teks) tetap dicek
+    'idsubsls': ['3201010001000100', '3201010001000200', ' 3201010001000300 ', '3201010001000400',
+                 '3201010001000500', '3201010001000500', '3201010001000600', '3201010001000600',
+                 '3201010001000600', '3201010001000700', '3201010001000800', None, '', '0',
+                 '3201010001000900', '3201010001001000', '3201010001001100', '3201010001001400',
+                 '3201010001001400', '3201010001001500', '3201010001001500'],
+    'nmsls': ['RT 001', 'RT 002', 'RT 003 ', None, 'RT 005', 'RT 005', 'RT 006', 'RT 006', 'RT 006',
+              'RT 007', 'rt 008', 'RT X', 'RT Y', 'RT Z', 'RT 009', 'RT 010', 'RT 011', 'RT 014', 'RT 014',
+              'RT 015', 'RT 015'],
+    'kdsubsls': ['00', '1', '001', '0', None, '', '02', '2', '02', '00', '00', '00', '00', '00',
+                 '10', '3', '00', '00', '00', '00', '00'],
+}
+
+MASTER = {
+    'idsubsls': ['3201010001000100', '3201010001000200', '3201010001000300', '3201010001000400',
+                 '3201010001000500', '3201010001000600', '3201010001000700', '3201010001000700',
+                 '3201010001000800', '3201010001000900', '3201010001001000', '3201010001001200',
+                 '3201010001001300', '3201010001001300', '3201010001001400', '3201010001001400', None],
+    'nmsls': ['RT 001', 'RT 002', 'RT 003', 'RT 004', 'RT 005', 'RT 006', 'RT 007', 'RT 007b',
+              'RT 008', 'RT 009', 'RT 010', 'RT 012', None, 'RT 013', 'RT 014', 'RT 014', 'RT tanpa id'],
+    'kdsubsls': ['0', '01', '1', '00', '00', '2', '00', '00', '00', '010', '03', '5', '00', '00', '00', '00', '00'],
+}
+
+# Urutan kolom sama dengan KOLOM
+HARAPAN = [
+    ('3201010001000100', 'RT 001', 'RT 001', '00', '00', '00', '0', 'Non Duplikasi', 'Sesuai'),
+    ('3201010001000200', 'RT 002', 'RT 002', '01', '1', '01', '01', 'Non Duplikasi', 'Sesuai'),
+    ('3201010001000300', 'RT 003', 'RT 003', '001', '001', '01', '1', 'Non Duplikasi', 'Beda KdSubSLS'),
+    ('3201010001000400', 'nan', 'RT 004', '00', '0', '00', '00', 'Non Duplikasi', 'Beda NMSLS'),
+    ('3201010001000500', 'RT 005', 'RT 005', '00', '', '00', '00', 'Duplikat (GPKG)', 'Sesuai'),
+    ('3201010001000500', 'RT 005', 'RT 005', '00', '', '00', '00', 'Duplikat (GPKG)', 'Sesuai'),
+    ('3201010001000600', 'RT 006', 'RT 006', '02', '02', '02', '2', 'Duplikat (GPKG)', 'Sesuai'),
+    ('3201010001000600', 'RT 006', 'RT 006', '02', '2', '02', '2', 'Duplikat (GPKG)', 'Sesuai'),
+    ('3201010001000600', 'RT 006', 'RT 006', '02', '02', '02', '2', 'Duplikat (GPKG)', 'Sesuai'),
+    ('3201010001000700', 'RT 007', 'RT 007b', '00', '00', '00', '00', 'Duplikat (Excel)', 'Beda NMSLS'),
+    ('3201010001000800', 'rt 008', 'RT 008', '00', '00', '00', '00', 'Non Duplikasi', 'Beda NMSLS'),
+    ('0', 'RT Z', '', '00', '00', '', '', 'Non Duplikasi', 'Tidak Ditemukan di Master'),
+    ('3201010001000900', 'RT 009', 'RT 009', '10', '10', '010', '010', 'Non Duplikasi', 'Beda KdSubSLS'),
+    ('3201010001001000', 'RT 010', 'RT 010', '03', '3', '03', '03', 'Non Duplikasi', 'Sesuai'),
+    ('3201010001001100', 'RT 011', '', '00', '00', '', '', 'Non Duplikasi', 'Tidak Ditemukan di Master'),
+    ('3201010001001400', 'RT 014', 'RT 014', '00', '00', '00', '00', 'Duplikat (Excel & GPKG)', 'Sesuai'),
+    ('3201010001001400', 'RT 014', 'RT 014', '00', '00', '00', '00', 'Duplikat (Excel & GPKG)', 'Sesuai'),
+    ('3201010001001500', 'RT 015', '', '00', '00', '', '', 'Duplikat (GPKG)', 'Tidak Ditemukan di Master'),
+    ('3201010001001500', 'RT 015', '', '00', '00', '', '', 'Duplikat (GPKG)', 'Tidak Ditemukan di Master'),
+    ('3201010001001200', '', 'RT 012', '', '', '05', '5', 'Non Duplikasi', TIDAK_DI_GPKG),
+    ('nan', '', 'RT tanpa id', '', '', '00', '00', 'Non Duplikasi', TIDAK_DI_GPKG),
+    ('3201010001001300', '', 'RT 013', '', '', '00', '00', 'Duplikat (Excel)', TIDAK_DI_GPKG),
+    ('=== ISSUE DIGIT KDSUBSLS ===', '', '', 'Total issue GPKG: 5', '', 'Total issue Excel: 5', '', '',
+     'Laporan Digit'),
+    ('3201010001000200', '', '', "GPKG - ID: 3201010001000200: kdsubsls '1' hanya 1 digit", '', '', '', '',
+     'Issue Digit GPKG'),
+    ('3201010001000300', '', '', "GPKG - ID: 3201010001000300: kdsubsls '001' lebih dari 2 digit", '', '', '', '',
+     'Issue Digit GPKG'),
+    ('3201010001000400', '', '', "GPKG - ID: 3201010001000400: kdsubsls '0' hanya 1 digit", '', '', '', '',
+     'Issue Digit GPKG'),
+    ('3201010001000600', '', '', "GPKG - ID: 3201010001000600: kdsubsls '2' hanya 1 digit", '', '', '', '',
+     'Issue Digit GPKG'),
+    ('3201010001001000', '', '', "GPKG - ID: 3201010001001000: kdsubsls '3' hanya 1 digit", '', '', '', '',
+     'Issue Digit GPKG'),
+    ('3201010001000100', '', '', '', '', "Excel - ID: 3201010001000100: kdsubsls '0' hanya 1 digit", '', '',
+     'Issue Digit Excel'),
+    ('3201010001000300', '', '', '', '', "Excel - ID: 3201010001000300: kdsubsls '1' hanya 1 digit", '', '',
+     'Issue Digit Excel'),
+    ('3201010001000600', '', '', '', '', "Excel - ID: 3201010001000600: kdsubsls '2' hanya 1 digit", '', '',
+     'Issue Digit Excel'),
+    ('3201010001000900', '', '', '', '', "Excel - ID: 3201010001000900: kdsubsls '010' lebih dari 2 digit", '', '',
+     'Issue Digit Excel'),
+    ('3201010001001200', '', '', '', '', "Excel - ID: 3201010001001200: kdsubsls '5' hanya 1 digit", '', '',
+     'Issue Digit Excel'),
+    ('=== LAPORAN DUPLIKASI IDSUB_SLS ===', '', '', 'Total duplikat GPKG: 4', '', 'Total duplikat Excel: 3', '', '',
+     'Laporan Duplikasi'),
+    # Loop lama menghitung setiap kemunculan dua kali; angka ini sengaja dipertahankan
+    ('3201010001000500', 'Duplikat 4 kali di GPKG', '', '', '', '', '', 'Duplikat (GPKG)', 'Detail Duplikasi'),
+    ('3201010001000600', 'Duplikat 6 kali di GPKG', '', '', '', '', '', 'Duplikat (GPKG)', 'Detail Duplikasi'),
+    ('3201010001001400', 'Duplikat 4 kali di GPKG', '', '', '', '', '', 'Duplikat (GPKG)', 'Detail Duplikasi'),
+    ('3201010001001500', 'Duplikat 4 kali di GPKG', '', '', '', '', '', 'Duplikat (GPKG)', 'Detail Duplikasi'),
+    ('3201010001000700', '', 'Duplikat 2 kali di Excel', '', '', '', '', 'Duplikat (Excel)', 'Detail Duplikasi'),
+    ('3201010001001300', '', 'Duplikat 2 kali di Excel', '', '', '', '', 'Duplikat (Excel)', 'Detail Duplikasi'),
+    ('3201010001001400', '', 'Duplikat 2 kali di Excel', '', '', '', '', 'Duplikat (Excel)', 'Detail Duplikasi'),
+]
+
+
+def _tulis(folder, gpkg, master):
+    frame = pd.DataFrame(gpkg)
+    gdf = gpd.GeoDataFrame(frame, geometry=[Point(i, i) for i in range(len(frame))], crs='EPSG:4326')
+    gdf.to_file(folder / 'uji.gpkg', driver='GPKG')
+    pd.DataFrame(master).to_excel(folder / 'uji.xlsx', index=False)
+    return folder / 'uji.gpkg', folder / 'uji.xlsx'
+
+
+def _baris(gpkg_path, excel_path):
+    hasil, laporan = sls_checker.run_check(gpkg_path, excel_path)
+    baris = [tuple(r) for r in hasil[KOLOM].astype(object).itertuples(index=False)]
+    # Bagian kandidat Master adalah tambahan setelah vektorisasi
+    baris += [tuple(r[k] for k in KOLOM) for r in laporan if r['Status'] not in ('Laporan Kandidat', 'Kandidat Master')]
+    return baris
+
+
+def test_sama_dengan_loop_lama(tmp_path):
+    baris = _baris(*_tulis(tmp_path, GPKG, MASTER))
+
+    assert [r for r in baris if r[-1] != TIDAK_DI_GPKG] == [r for r in HARAPAN if r[-1] != TIDAK_DI_GPKG]
+    assert sorted(r for r in baris if r[-1] == TIDAK_DI_GPKG) == sorted(r for r in HARAPAN if r[-1] == TIDAK_DI_GPKG)
+
+
+def test_idsubsls_angka_nol_dilewati(tmp_path):
+    # Loop lama melewati id yang falsy; kolom id numerik bisa berisi 0
+    gpkg = {'idsubsls': [3201010001000100, 0], 'nmsls': ['RT 001', 'RT 0'], 'kdsubsls': ['00', '00']}
+    master = {'idsubsls': ['3201010001000100'], 'nmsls': ['RT 001'], 'kdsubsls': ['00']}
+
+    baris = _baris(*_tulis(tmp_path, gpkg, master))
+
+    assert [r[0] for r in baris if r[-1] in ('Sesuai', 'Tidak Ditemukan di Master')] == ['3201010001000100']
@@ -0,0 +1,40 @@
+"""Regresi: cek spasial tanpa pasangan kandidat overlap."""
+import sys
+from pathlib import Path
+
+import pytest
+
+gpd = pytest.importorskip('geopandas')
+shapely = pytest.importorskip('shapely')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sls_spasial  # noqa: E402
+
+
+def _gdf(ids, kotak):
+    return gpd.GeoDataFrame({'idsubsls': ids}, geometry=[shapely.box(*k) for k in kotak])
+
+
+@pytest.mark.parametrize('ids, kotak', [
+    # Dua poligon terpisah di satu kecamatan
+    (['3201010001000100', '3201010001000200'], [(0, 0, 1, 1), (5, 5, 6, 6)]),
+    # Kecamatan kedua hanya berisi satu poligon; kecamatan tidak bersinggungan
+    (['3201010001000100', '3201010001000200', '3201020001000100'],
+     [(0, 0, 1, 1), (5, 5, 6, 6), (20, 20, 21, 21)]),
+])
+def test_tanpa_kandidat_overlap(ids, kotak):
+    masalah, ringkasan = sls_spasial.check_spatial('x', gdf=_gdf(ids, kotak))
+
+    assert masalah.empty
+    assert ringkasan['fitur'] == len(ids)
+    assert all(ringkasan[jenis] == 0 for jenis in sls_spasial.JENIS_MASALAH)
+
+
+def test_overlap_tetap_terdeteksi():
+    masalah, ringkasan = sls_spasial.check_spatial('x', gdf=_gdf(
+        ['3201010001000100', '3201010001000200', '3201020001000100'],
+        [(0, 0, 2, 2), (1, 1, 3, 3), (10, 10, 11, 11)]))
+
+    assert ringkasan['Overlap'] == 1
+    assert masalah[['idsubsls', 'idsubsls_lain']].values.tolist() == [['3201010001000100', '3201010001000200']]